@@ -1,6 +1,97 @@
 import requests
+import threading
+import time
+import http_client
 from typing import Optional
 
+RATES_URL = "https://open.er-api.com/v6/latest/{}"
+RATES_TTL = 60 * 60  # Seconds a rate table is served before it is refreshed (rates update at most hourly)
+RATES_REFRESH_AHEAD = 0.9  # Fraction of the TTL after which a table is refreshed in the background
+
+
+class ExchangeRateCache:
+    """
+    Exchange rate tables cached per base currency.
+
+    A table younger than the TTL is served from memory. Once it passes
+    RATES_REFRESH_AHEAD of the TTL, a background thread downloads a fresh one while
+    the cached table keeps being served, so callers only wait for the network the
+    first time a base currency is requested.
+    """
+
+    def __init__(self, ttl: float = RATES_TTL, refresh_ahead: float = RATES_REFRESH_AHEAD):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.tables = {}  # base currency -> (rates, fetched_at)
+        self.refreshing = set()  # base currencies with a background refresh running
+        self.lock = threading.Lock()
+
+    def __fetch(self, base: str) -> dict:
+        response = http_client.get(RATES_URL.format(base))
+        response.raise_for_status()
+
+        rates = response.json()['rates']
+        with self.lock:
+            self.tables[base] = (rates, time.monotonic())
+        return rates
+
+    def __refresh_in_background(self, base: str):
+        def refresh():
+            try:
+                self.__fetch(base)
+            except Exception as e:
+                print(f"Error refreshing {base} exchange rates: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing.discard(base)
+
+        with self.lock:
+            if base in self.refreshing:
+                return
+            self.refreshing.add(base)
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_rates(self, base: str) -> dict:
+        """
+        Get the exchange rate table of a base currency.
+
+        Args:
+            base (str): The base currency code (e.g., 'USD').
+
+        Returns:
+            dict: Currency code -> rate, the amount of that currency one unit of base buys.
+        """
+        with self.lock:
+            entry = self.tables.get(base)
+
+        if entry is None:
+            return self.__fetch(base)
+
+        rates, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        if age >= self.ttl * self.refresh_ahead:
+            # Keep serving the cached table, even past the TTL, until the refresh lands
+            self.__refresh_in_background(base)
+
+        return rates
+
+    def clear(self):
+        with self.lock:
+            self.tables.clear()
+
+
+rate_cache = ExchangeRateCache()
+
+
+def set_rates_ttl(ttl: float):
+    """
+    Change how long exchange rate tables are cached.
+
+    Args:
+        ttl (float): Seconds a rate table is served before it is refreshed.
+    """
+    rate_cache.ttl = ttl
+
 
 def get_all_currencies():
     """
@@ -11,12 +102,7 @@ def get_all_currencies():
     """
     try:
         print("Fetching all currencies (one-time operation)...")
-        url = "https://open.er-api.com/v6/latest/USD"
-        response = requests.get(url)
-        response.raise_for_status()
-
-        data = response.json()
-        return set(data['rates'].keys())
+        return set(rate_cache.get_rates('USD').keys())
 
     except Exception as e:
         print(f"Error fetching currencies: {str(e)}")
@@ -25,7 +111,7 @@ def get_all_currencies():
 
 def convert_currency(amount, from_currency, to_currency) -> Optional[float]:
     """
-    Convert an amount from one currency to another using the latest exchange rates.
+    Convert an amount from one currency to another using the cached exchange rates.
 
     Args:
         amount (float): The amount to convert.
@@ -35,17 +121,17 @@ def convert_currency(amount, from_currency, to_currency) -> Optional[float]:
     Returns:
         Optional[float]: The converted amount, or None if conversion fails.
     """
-    try:
-        # Fetch the latest exchange rates
-        url = f"https://open.er-api.com/v6/latest/{from_currency}"
-        response = requests.get(url)
-        response.raise_for_status()
+    if amount is None:
+        return None
+    if from_currency == to_currency:
+        return amount
 
-        data = response.json()
+    try:
+        rates = rate_cache.get_rates(from_currency)
 
         # Check if the target currency exists in the rates
-        if to_currency in data['rates']:
-            rate = data['rates'][to_currency]
+        if to_currency in rates:
+            rate = rates[to_currency]
             return amount * rate
         else:
             print(f"Currency '{to_currency}' not found in exchange rates.")
@@ -0,0 +1,171 @@
+import json
+import os
+import time
+import http_client
+from typing import Dict, Optional, Tuple
+
+EXCHANGE_INFO_URL = "https://api.binance.com/api/v3/exchangeInfo"
+SNAPSHOT_PATH = "cache/exchange_info.json"
+SNAPSHOT_TTL = 24 * 60 * 60  # Seconds the snapshot is used without asking Binance
+
+# Quote assets tried in order when pricing a token, the first pair that exists wins
+QUOTE_PRIORITY = ("USDT", "FDUSD", "USDC", "TUSD", "BTC", "ETH", "BNB")
+# Quotes pegged to USD, their prices are used as USD prices directly
+USD_QUOTES = {"USDT", "FDUSD", "USDC", "TUSD"}
+
+
+class ExchangeInfo:
+    """
+    Binance exchange info kept as a compact on-disk snapshot.
+
+    Only trading symbols are kept, each with its base asset, quote asset and filters.
+    The snapshot is used as-is while younger than the TTL. After that it is revalidated
+    with the ETag / Last-Modified of the previous download, so an unchanged exchange
+    info costs a 304 instead of the multi-megabyte payload.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH, ttl: float = SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.snapshot = None
+        self.pairs = {}  # base asset -> {quote asset: symbol}
+
+    def __load_snapshot(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable exchange info snapshot {self.path}: {e}")
+            return None
+
+    def __save_snapshot(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def __download(self, snapshot: Optional[dict]) -> dict:
+        headers = {}
+        if snapshot and snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot and snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+
+        response = http_client.get(EXCHANGE_INFO_URL, headers=headers)
+        if response.status_code == 304 and snapshot:
+            snapshot["fetched_at"] = time.time()
+            return snapshot
+        response.raise_for_status()
+
+        symbols = {}
+        for symbol in response.json()["symbols"]:
+            if symbol["status"] != "TRADING":
+                continue
+
+            symbols[symbol["symbol"]] = {
+                "base": symbol["baseAsset"],
+                "quote": symbol["quoteAsset"],
+                "filters": {
+                    item["filterType"]: {key: value for key, value in item.items() if key != "filterType"}
+                    for item in symbol.get("filters", [])
+                },
+            }
+
+        return {
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "symbols": symbols,
+        }
+
+    def load(self, force_refresh: bool = False):
+        """
+        Load the snapshot, downloading or revalidating it once it is older than the TTL.
+
+        Args:
+            force_refresh (bool): Revalidate even if the snapshot is still fresh.
+        """
+        snapshot = self.__load_snapshot()
+        if force_refresh or snapshot is None or time.time() - snapshot.get("fetched_at", 0) >= self.ttl:
+            try:
+                print("Refreshing exchange info from Binance...")
+                snapshot = self.__download(snapshot)
+                self.snapshot = snapshot
+                self.__save_snapshot()
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                # A stale snapshot is better than no token list at all
+                print(f"Error refreshing exchange info, using the saved snapshot: {e}")
+
+        self.snapshot = snapshot
+        self.pairs = {}
+        for symbol, info in snapshot["symbols"].items():
+            self.pairs.setdefault(info["base"], {})[info["quote"]] = symbol
+
+    def __ensure_loaded(self):
+        if self.snapshot is None:
+            self.load()
+
+    def base_assets(self) -> set:
+        """
+        Get every base asset that has at least one trading pair.
+
+        Returns:
+            set: The base asset symbols.
+        """
+        self.__ensure_loaded()
+        return set(self.pairs)
+
+    def quotes(self, token_id: str) -> Dict[str, str]:
+        """
+        Get the trading pairs of a base asset.
+
+        Args:
+            token_id (str): The token symbol (e.g., 'BTC')
+
+        Returns:
+            Dict[str, str]: Quote asset -> trading pair symbol
+        """
+        self.__ensure_loaded()
+        return self.pairs.get(token_id.upper(), {})
+
+    def route(self, token_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Pick the trading pair used to price a token.
+
+        Args:
+            token_id (str): The token symbol (e.g., 'BTC')
+
+        Returns:
+            Optional[Tuple[str, str]]: (pair symbol, quote asset), or None if no supported quote exists
+        """
+        quotes = self.quotes(token_id)
+        for quote in QUOTE_PRIORITY:
+            if quote in quotes:
+                return quotes[quote], quote
+        return None
+
+    def filters(self, symbol: str) -> dict:
+        """
+        Get the filters of a trading pair.
+
+        Args:
+            symbol (str): The trading pair symbol (e.g., 'BTCUSDT')
+
+        Returns:
+            dict: Filter type (e.g., 'PRICE_FILTER') -> filter parameters
+        """
+        self.__ensure_loaded()
+        info = self.snapshot["symbols"].get(symbol.upper())
+        return info["filters"] if info else {}
+
+
+exchange_info = ExchangeInfo()
@@ -0,0 +1,61 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool and retry policy shared by every HTTP call of the program
+TIMEOUT = (5, 10)  # (connect, read) seconds
+MAX_HOSTS = 10  # Hosts whose connection pools are kept open
+MAX_CONNECTIONS_PER_HOST = 4  # Keep-alive connections kept open per host
+MAX_RETRIES = 3  # Retries of failed connections and retryable responses
+RETRY_BACKOFF = 0.5  # Seconds, doubled after each retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+
+
+def get_session() -> requests.Session:
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    The session keeps connections alive between calls, so polling a price every
+    second reuses one TCP/TLS connection instead of opening a new one each time.
+
+    Returns:
+        requests.Session: The shared session with pooling and retries configured.
+    """
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=MAX_HOSTS,
+            pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+            max_retries=retry,
+        )
+
+        _session = requests.Session()
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Send a GET request through the shared session.
+
+    Args:
+        url (str): The URL to request.
+        **kwargs: Extra arguments for requests (params, headers, ...).
+
+    Returns:
+        requests.Response: The response of the request.
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    return get_session().get(url, **kwargs)
@@ -1,6 +1,6 @@
 from currencies import get_all_currencies
 from tokens import get_all_tokens, check_token_exists
-from monitor_token_price import monitor_price_changes
+from monitor_token_price import monitor_price_changes, monitor_watchlist
 
 
 def main():
@@ -19,9 +19,10 @@ def main():
             print("1. View all available tokens - Press '1'")
             print(f"2. Change currency (current: {currency}) - Press '2'")
             print("3. Monitor token price - Press '3'")
-            print("4. Exit - Press '4'")
+            print("4. Monitor watchlist - Press '4'")
+            print("5. Exit - Press '5'")
 
-            mode_choice = input("Select an option (1/2/3/4): ").strip()
+            mode_choice = input("Select an option (1/2/3/4/5): ").strip()
 
             if mode_choice == '1':
                 print("\033c", end="")
@@ -63,6 +64,32 @@ def main():
                         break
 
             elif mode_choice == '4':
+                print("\033c", end="")
+
+                token_ids = input(
+                    "Enter token symbols separated by commas (e.g., BTC, ETH, SOL): ").strip().upper()
+                token_ids = list(dict.fromkeys(
+                    token_id.strip() for token_id in token_ids.split(",") if token_id.strip()))
+
+                watchlist = []
+                for token_id in token_ids:
+                    exists, message = check_token_exists(token_id, allTokens)
+                    if exists:
+                        watchlist.append(token_id)
+                    else:
+                        print(message)
+
+                if not watchlist:
+                    print("No valid tokens to watch.")
+                    input("Press Enter to continue...")
+                    continue
+                if len(watchlist) < len(token_ids):
+                    input("Press Enter to watch the valid tokens...")
+
+                print("\033c", end="")
+                monitor_watchlist(watchlist, currency)
+
+            elif mode_choice == '5':
                 print("Exiting the program. Goodbye!")
                 break
 
@@ -2,7 +2,9 @@ import sys
 import time
 from getch import getch
 from currencies import convert_currency
-from tokens import get_token_price
+from tokens import get_token_price, get_token_prices
+from price_stream import BinancePriceStream
+from exchange_info import exchange_info, USD_QUOTES
 
 if sys.platform == 'win32':
     import msvcrt
@@ -23,11 +25,26 @@ else:
     def get_key():
         return sys.stdin.read(1)
 
+REST_POLL_INTERVAL = 1  # Seconds between REST price requests while the stream is down or silent
+KEY_CHECK_INTERVAL = 0.05  # Seconds between keyboard checks
+WATCHLIST_REFRESH_INTERVAL = 1  # Seconds between watchlist price requests
+
+
 def monitor_price_changes(token_id: str, currency: str) -> bool:
     print(f"Starting to monitor {token_id} price...")
     print("Press 'x' to go back.")
     last_price = None
 
+    # Prices are pushed by the stream, REST polling is only used while it is down or silent.
+    # Pairs quoted in a crypto asset need a second price to get to USD, so they are polled.
+    route = exchange_info.route(token_id)
+    stream = None
+    if route and route[1] in USD_QUOTES:
+        stream = BinancePriceStream(route[0])
+        stream.start()
+    streaming = False
+    next_poll = 0
+
     if sys.platform != 'win32':
         fd = sys.stdin.fileno()
         old_settings = termios.tcgetattr(fd)
@@ -35,8 +52,30 @@ def monitor_price_changes(token_id: str, currency: str) -> bool:
 
     try:
         while True:
-            current_price = convert_currency(
-                get_token_price(token_id), 'USD', currency)
+            usd_price = None
+            if stream and stream.connected.is_set():
+                if not streaming:
+                    print("Live price stream connected.")
+                    streaming = True
+                usd_price = stream.wait_for_price(KEY_CHECK_INTERVAL)
+
+                # A quiet pair can go minutes without a trade, fall back to REST when no tick arrived in time
+                if usd_price is not None:
+                    next_poll = time.time() + REST_POLL_INTERVAL
+                elif time.time() >= next_poll:
+                    usd_price = get_token_price(token_id)
+                    next_poll = time.time() + REST_POLL_INTERVAL
+            else:
+                if streaming:
+                    print("Live price stream lost, polling prices until it reconnects...")
+                    streaming = False
+                if time.time() >= next_poll:
+                    usd_price = get_token_price(token_id)
+                    next_poll = time.time() + REST_POLL_INTERVAL
+                else:
+                    time.sleep(KEY_CHECK_INTERVAL)
+
+            current_price = convert_currency(usd_price, 'USD', currency)
 
             if current_price is not None:
                 if last_price is None:
@@ -51,18 +90,106 @@ def monitor_price_changes(token_id: str, currency: str) -> bool:
 
                 last_price = current_price
 
+            if is_key_pressed():
+                key = get_key()
+                if key.lower() == 'x':
+                    print("\nStopping current monitoring, returning to token selection...")
+                    return True
+
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")
+        return True
+    finally:
+        if stream:
+            stream.stop()
+        if sys.platform != 'win32':
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+
+def format_change(change_percent) -> str:
+    if change_percent is None:
+        return "-"
+    direction = "↑" if change_percent > 0 else ("↓" if change_percent < 0 else " ")
+    return f"{direction} {abs(change_percent):.2f}%"
+
+
+def render_watchlist(token_ids: list, prices: dict, last_prices: dict, first_prices: dict, currency: str):
+    """
+    Redraw the watchlist table in place.
+
+    Args:
+        token_ids (list): The token symbols, in display order.
+        prices (dict): Token symbol -> current price.
+        last_prices (dict): Token symbol -> price of the previous tick.
+        first_prices (dict): Token symbol -> price when monitoring started.
+        currency (str): The currency the prices are shown in.
+    """
+    lines = [
+        f"Watchlist ({len(token_ids)} tokens, {currency}) - updated {time.strftime('%H:%M:%S')} - Press 'x' to go back.",
+        "",
+        f"{'Token':<10} {'Price':>20} {'Tick':>10} {'Session':>10}",
+        "-" * 53,
+    ]
+    for token_id in token_ids:
+        price = prices.get(token_id)
+        if price is None:
+            lines.append(f"{token_id:<10} {'n/a':>20} {'-':>10} {'-':>10}")
+            continue
+
+        last_price = last_prices.get(token_id)
+        first_price = first_prices.get(token_id)
+        tick_change = (price - last_price) / last_price * 100 if last_price else None
+        session_change = (price - first_price) / first_price * 100 if first_price else None
+        lines.append(f"{token_id:<10} {price:>20,.2f} {format_change(tick_change):>10} {format_change(session_change):>10}")
+
+    # Move to the top left and clear, then draw the whole table in one write
+    print("\033[H\033[J" + "\n".join(lines), flush=True)
+
+
+def monitor_watchlist(token_ids: list, currency: str) -> bool:
+    """
+    Monitor the prices of many tokens, fetched with one request per refresh.
+
+    Args:
+        token_ids (list): The token symbols to watch (e.g., ['BTC', 'ETH']).
+        currency (str): The currency the prices are shown in.
+
+    Returns:
+        bool: True when monitoring was stopped by the user.
+    """
+    last_prices = {}
+    first_prices = {}
+
+    if sys.platform != 'win32':
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+    try:
+        while True:
+            prices = {}
+            for token_id, usd_price in get_token_prices(token_ids).items():
+                price = convert_currency(usd_price, 'USD', currency)
+                if price is not None:
+                    prices[token_id] = price
+
+            render_watchlist(token_ids, prices, last_prices, first_prices, currency)
+            for token_id, price in prices.items():
+                first_prices.setdefault(token_id, price)
+            last_prices.update(prices)
+
             start_time = time.time()
-            while time.time() - start_time < 1:
+            while time.time() - start_time < WATCHLIST_REFRESH_INTERVAL:
                 if is_key_pressed():
                     key = get_key()
                     if key.lower() == 'x':
-                        print("\nStopping current monitoring, returning to token selection...")
+                        print("\nStopping watchlist monitoring, returning to menu...")
                         return True
-                time.sleep(0.05)
+                time.sleep(KEY_CHECK_INTERVAL)
 
     except KeyboardInterrupt:
         print("\nMonitoring stopped.")
         return True
     finally:
         if sys.platform != 'win32':
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
\ No newline at end of file
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
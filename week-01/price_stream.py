@@ -0,0 +1,107 @@
+import json
+import threading
+from typing import Optional
+
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from websockets.sync.client import connect
+
+STREAM_URL = "wss://stream.binance.com:9443/ws"
+STREAM_OPEN_TIMEOUT = 5  # Seconds to wait for the WebSocket handshake
+RECONNECT_BASE_DELAY = 1  # Seconds before the first reconnect, doubled after each failure
+RECONNECT_MAX_DELAY = 30  # Upper bound of the reconnect delay in seconds
+
+# Field holding the price in each stream's messages
+PRICE_FIELDS = {
+    "trade": "p",  # Price of every trade
+    "miniTicker": "c",  # Close price, pushed once per second
+}
+
+
+class BinancePriceStream:
+    """
+    Live price of one symbol pushed by a Binance WebSocket stream.
+
+    A background thread keeps the stream connected and reconnects with backoff
+    when it drops. While it is down, `connected` is cleared so callers can fall
+    back to REST polling.
+    """
+
+    def __init__(self, symbol: str, stream: str = "trade"):
+        if stream not in PRICE_FIELDS:
+            raise ValueError(f"Stream must be one of {', '.join(PRICE_FIELDS)}")
+
+        self.url = f"{STREAM_URL}/{symbol.lower()}@{stream}"
+        self.price_field = PRICE_FIELDS[stream]
+
+        self.price = None
+        self.version = 0  # Incremented on every tick
+        self.seen_version = 0  # Last version returned by wait_for_price
+        self.condition = threading.Condition()
+        self.connected = threading.Event()
+        self.stopped = threading.Event()
+        self.websocket = None
+        self.thread = None
+
+    def start(self):
+        """
+        Start receiving prices in a background thread.
+        """
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def __run(self):
+        delay = RECONNECT_BASE_DELAY
+        while not self.stopped.is_set():
+            try:
+                with connect(self.url, open_timeout=STREAM_OPEN_TIMEOUT) as websocket:
+                    self.websocket = websocket
+                    self.connected.set()
+                    delay = RECONNECT_BASE_DELAY
+
+                    for message in websocket:
+                        price = json.loads(message).get(self.price_field)
+                        if price is None:
+                            continue
+
+                        with self.condition:
+                            self.price = float(price)
+                            self.version += 1
+                            self.condition.notify_all()
+            except (ConnectionClosed, InvalidHandshake, OSError, TimeoutError, json.JSONDecodeError) as e:
+                if not self.stopped.is_set():
+                    print(f"Error in price stream {self.url}: {e}. Reconnecting in {delay}s...")
+            finally:
+                self.websocket = None
+                self.connected.clear()
+
+            # Wait before reconnecting, or exit right away once stopped
+            if self.stopped.wait(delay):
+                break
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def wait_for_price(self, timeout: float) -> Optional[float]:
+        """
+        Wait for a price newer than the last one returned.
+
+        Args:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            Optional[float]: The new price, or None if no tick arrived in time.
+        """
+        with self.condition:
+            if self.condition.wait_for(lambda: self.version != self.seen_version, timeout):
+                self.seen_version = self.version
+                return self.price
+            return None
+
+    def stop(self):
+        """
+        Close the stream and stop reconnecting.
+        """
+        self.stopped.set()
+        websocket = self.websocket
+        if websocket is not None:
+            websocket.close()
+        if self.thread is not None:
+            self.thread.join(timeout=STREAM_OPEN_TIMEOUT)
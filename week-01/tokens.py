@@ -1,33 +1,23 @@
+import json
 import requests
-from typing import Optional, Tuple
+import http_client
+from exchange_info import exchange_info, USD_QUOTES
+from typing import Dict, List, Optional, Tuple
 
 
 def get_all_tokens() -> set:
     """
-    Fetch all trading pairs from Binance and return a set of unique token symbols.
+    Get all tokens that can be priced from the Binance exchange info snapshot.
 
     Returns:
         set: A set of unique token symbols available for trading on Binance.
     """
     try:
-        print("Fetching all tokens from Binance (one-time operation)...")
+        print("Loading tokens from Binance exchange info...")
+        exchange_info.load()
 
-        # Binance API endpoint for exchange information
-        url = "https://api.binance.com/api/v3/exchangeInfo"
-        response = requests.get(url)
-        response.raise_for_status()
-
-        data = response.json()
-        tokens = set()
-
-        # Extract all token symbols from trading pairs
-        for symbol in data['symbols']:
-            # Only include USDT trading pairs to get base tokens
-            if symbol['symbol'].endswith('USDT'):
-                base_token = symbol['baseAsset']
-                tokens.add(base_token)
-
-        return tokens
+        # Only include tokens that trade against one of the supported quote assets
+        return {token for token in exchange_info.base_assets() if exchange_info.route(token)}
 
     except Exception as e:
         print(f"Error fetching tokens: {str(e)}")
@@ -51,45 +41,98 @@ def check_token_exists(token_id: str, allTokens: set) -> Tuple[bool, str]:
         return False, f"Token '{token_id}' not exists or not available for trading."
 
 
-def get_token_price(token_id: str) -> Optional[float]:
+def get_pair_prices(symbols: List[str]) -> Dict[str, float]:
     """
-    Get the current price of a token using Binance API.
+    Get the current prices of trading pairs with one Binance API request.
 
     Args:
-        token_id (str): The token symbol (e.g., 'BTC', 'ETH')
+        symbols (List[str]): The trading pair symbols (e.g., ['BTCUSDT', 'ETHBTC'])
 
     Returns:
-        Optional[float]: The current price in USD, or None if the token is not found
+        Dict[str, float]: Trading pair symbol -> current price in its quote asset
     """
-    try:
-        # Convert token_id to uppercase for Binance API
-        symbol = f"{token_id.upper()}USDT"
+    # Binance API endpoint for ticker price, the symbols parameter takes a JSON array
+    url = "https://api.binance.com/api/v3/ticker/price"
+    params = {
+        "symbols": json.dumps(list(dict.fromkeys(symbols)), separators=(",", ":"))
+    }
+
+    response = http_client.get(url, params=params)
+    response.raise_for_status()
 
-        # Binance API endpoint for ticker price
-        url = f"https://api.binance.com/api/v3/ticker/price"
+    return {ticker["symbol"]: float(ticker["price"]) for ticker in response.json()}
 
-        # Parameters for the API request
-        params = {
-            "symbol": symbol
-        }
 
-        # Make the API request
-        response = requests.get(url, params=params)
-        response.raise_for_status()
+def get_token_prices(token_ids: List[str]) -> Dict[str, float]:
+    """
+    Get the current USD prices of many tokens with one Binance API request.
 
-        # Parse the response
-        data = response.json()
+    Each token is priced through the first pair that exists for it (USDT, FDUSD, ...,
+    BTC, ETH, BNB). Pairs quoted in a crypto asset are converted to USD with the
+    price of that asset, fetched in the same request.
 
-        # Extract the price
-        if "price" in data:
-            return float(data["price"])
-        else:
-            print(f"Price not found for {token_id}")
-            return None
+    Args:
+        token_ids (List[str]): The token symbols (e.g., ['BTC', 'ETH'])
+
+    Returns:
+        Dict[str, float]: Token symbol -> current price in USD, without tokens that could not be priced
+    """
+    try:
+        routes = {}
+        for token_id in token_ids:
+            route = exchange_info.route(token_id)
+            if route is None:
+                print(f"No trading pair found to price {token_id}")
+                continue
+            routes[token_id] = route
+
+        # Non-USD quotes need their own USD pair in the same request
+        quote_routes = {}
+        for _, quote in routes.values():
+            if quote not in USD_QUOTES and quote not in quote_routes:
+                quote_route = exchange_info.route(quote)
+                if quote_route and quote_route[1] in USD_QUOTES:
+                    quote_routes[quote] = quote_route
+
+        symbols = [symbol for symbol, _ in routes.values()] + [symbol for symbol, _ in quote_routes.values()]
+        if not symbols:
+            return {}
+        pair_prices = get_pair_prices(symbols)
+
+        prices = {}
+        for token_id, (symbol, quote) in routes.items():
+            price = pair_prices.get(symbol)
+            if price is not None and quote not in USD_QUOTES:
+                quote_symbol = quote_routes.get(quote, (None,))[0]
+                price = price * pair_prices[quote_symbol] if quote_symbol in pair_prices else None
+
+            if price is not None:
+                prices[token_id] = price
+
+        return prices
 
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching price: {e}")
-        return None
+        print(f"Error fetching prices: {e}")
+        return {}
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return None
+        return {}
+
+
+def get_token_price(token_id: str) -> Optional[float]:
+    """
+    Get the current price of a token using Binance API.
+
+    Args:
+        token_id (str): The token symbol (e.g., 'BTC', 'ETH')
+
+    Returns:
+        Optional[float]: The current price in USD, or None if the token is not found
+    """
+    # Convert token_id to uppercase for Binance API
+    token_id = token_id.upper()
+    price = get_token_prices([token_id]).get(token_id)
+    if price is None:
+        print(f"Price not found for {token_id}")
+
+    return price
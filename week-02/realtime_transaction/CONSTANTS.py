@@ -16,3 +16,59 @@ WS_ENDPOINT = {
     TESTNET: "wss://api.testnet.solana.com",
     LOCAL: "ws://localhost:8900"
 }
+
+SUBSCRIBE_TIMEOUT = 10  # Seconds to wait for a logsSubscribe confirmation
+PING_INTERVAL = 20  # Seconds between WebSocket keepalive pings
+PING_TIMEOUT = 20  # Seconds without a pong before the connection is considered dead
+RECONNECT_BASE_DELAY = 1  # First reconnect delay in seconds, doubled after each failed attempt
+RECONNECT_MAX_DELAY = 60  # Upper bound of the reconnect delay in seconds
+BACKFILL_PAGE_LIMIT = 1000  # Maximum signatures returned by one getSignaturesForAddress call
+
+# Commitment levels: processed/confirmed report a transaction as provisional right away,
+# then it is upgraded once finalized or retracted if its fork is dropped
+PROCESSED = 'processed'
+CONFIRMED = 'confirmed'
+FINALIZED = 'finalized'
+COMMITMENT_LEVELS = (PROCESSED, CONFIRMED, FINALIZED)
+FINALITY_POLL_INTERVAL = 2  # Seconds between getSignatureStatuses checks of provisional transactions
+FINALITY_TIMEOUT = 60  # Seconds a provisional transaction may stay unknown before it is retracted
+FINALITY_DRAIN_MARGIN = 10  # Extra seconds past FINALITY_TIMEOUT to wait for provisional transactions at exit
+SIGNATURE_STATUSES_LIMIT = 256  # Maximum signatures per getSignatureStatuses call
+
+# Requests per second allowed on each RPC endpoint, shared by all fetch workers
+RPC_RATE_LIMIT = {
+    MAINNET: 4,
+    DEVNET: 10,
+    TESTNET: 10,
+    LOCAL: 100
+}
+
+FETCH_WORKERS = 4  # Concurrent transaction details fetches
+DETAILS_MAX_RETRIES = 3  # Attempts before a transaction is skipped
+DETAILS_RETRY_DELAY = 1  # Seconds between attempts while details are not yet available
+RENDER_WINDOW = 0.5  # Seconds of results collected before rendering them in slot order
+
+# Processed signatures are remembered for at least this many slots (~10 minutes)
+DEDUP_WINDOW_SLOTS = 1500
+DEDUP_CAPACITY = 50_000  # Signatures per dedup generation, bounds memory
+DEDUP_FALSE_POSITIVE_RATE = 1e-6  # Target chance of skipping a new signature as already seen
+DEDUP_CHECKPOINT_INTERVAL = 50  # New signatures between dedup checkpoints
+DEDUP_CHECKPOINT_PATH = "checkpoints/processed_signatures.json"
+
+# Ingestion modes: "logs" follows logsSubscribe per wallet, "blocks" scans every finalized block
+LOGS = 'logs'
+BLOCKS = 'blocks'
+INGESTION_MODES = (LOGS, BLOCKS)
+SLOT_POLL_INTERVAL = 1  # Seconds between getSlot polls once caught up with the tip
+BLOCK_RANGE_LIMIT = 50  # Maximum slots requested per getBlocks call
+BLOCK_MAX_RETRIES = 5  # Attempts to fetch a block before its slot is given up on
+BLOCK_RETRY_DELAY = 1  # Seconds before the first block retry, doubled after each failure
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+# Shared HTTP clients: one keep-alive pool per host, reused by every RPC request
+HTTP_TIMEOUT = 30  # Seconds to wait for a response
+HTTP_CONNECT_TIMEOUT = 10  # Seconds to wait for a TCP/TLS connection
+HTTP_MAX_CONNECTIONS_PER_HOST = FETCH_WORKERS + 2  # Fetch workers plus the block stream and finality tracker
+HTTP_KEEPALIVE_EXPIRY = 60  # Seconds an idle connection is kept open
+HTTP_CONNECT_RETRIES = 3  # Retries of failed connection attempts (responses are retried by the callers)
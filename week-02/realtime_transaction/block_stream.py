@@ -0,0 +1,123 @@
+import asyncio
+from solders.pubkey import Pubkey
+from solders.rpc.responses import GetTransactionResp
+from solders.transaction_status import EncodedConfirmedTransactionWithStatusMeta
+from transaction_details import TransactionDetails
+from CONSTANTS import SLOT_POLL_INTERVAL, BLOCK_RANGE_LIMIT, BLOCK_MAX_RETRIES, BLOCK_RETRY_DELAY
+
+
+class SolanaBlockStream:
+    """
+    Block-based ingestion: follow the finalized slot, fetch every new block with full
+    transactions and match each transaction against the watched account keys in memory.
+
+    One getBlock call covers every watched wallet active in that slot, instead of one
+    getTransaction call per log notification.
+    """
+
+    def __init__(self, details_fetcher, limiter):
+        self.details_fetcher = details_fetcher
+        self.limiter = limiter
+
+        self.watched = {}  # Pubkey -> wallet address
+        self.next_slot = None
+        self.blocks_scanned = 0
+        self.transactions_scanned = 0
+        self.block_retries = 0
+        self.failed_slots = []  # Blocks that could not be fetched after BLOCK_MAX_RETRIES attempts
+
+    def watch(self, wallet_address):
+        self.watched[Pubkey.from_string(wallet_address)] = wallet_address
+
+    def unwatch(self, wallet_address):
+        self.watched.pop(Pubkey.from_string(wallet_address), None)
+
+    async def run(self, handler):
+        """
+        Scan new blocks forever, calling handler(wallet_address, signature, slot, details) for every match
+        """
+        while True:
+            await self.limiter.acquire()
+            tip = await self.details_fetcher.get_slot()
+            if tip is None or (self.next_slot is not None and tip < self.next_slot):
+                await asyncio.sleep(SLOT_POLL_INTERVAL)
+                continue
+
+            # Start at the current tip, history is not replayed
+            if self.next_slot is None:
+                self.next_slot = tip
+
+            end_slot = min(tip, self.next_slot + BLOCK_RANGE_LIMIT - 1)
+
+            # Skipped slots have no block, ask which slots actually produced one
+            await self.limiter.acquire()
+            slots = await self.details_fetcher.get_blocks(self.next_slot, end_slot)
+            if slots is None:
+                await asyncio.sleep(SLOT_POLL_INTERVAL)
+                continue
+
+            for slot in slots:
+                block = await self.__fetch_block(slot)
+                if block is not None:
+                    await self.__scan_block(slot, block, handler)
+
+                # Only move past a slot once its block was scanned or given up on
+                self.next_slot = slot + 1
+
+            self.next_slot = end_slot + 1
+
+    async def __fetch_block(self, slot):
+        """
+        Get a block with exponential backoff, None once every attempt failed
+        """
+        for attempt in range(BLOCK_MAX_RETRIES):
+            await self.limiter.acquire()
+            block = await self.details_fetcher.get_block(slot)
+            if block is not None:
+                return block
+
+            if attempt < BLOCK_MAX_RETRIES - 1:
+                delay = BLOCK_RETRY_DELAY * 2 ** attempt
+                self.block_retries += 1
+                print(f"Block {slot} not fetched, retrying in {delay}s (attempt {attempt + 2}/{BLOCK_MAX_RETRIES})...")
+                await asyncio.sleep(delay)
+
+        # Matches in this block are lost, keep the slot so it shows up in the metrics
+        self.failed_slots.append(slot)
+        print(f"Giving up on block {slot} after {BLOCK_MAX_RETRIES} attempts, its transactions are missed")
+        return None
+
+    async def __scan_block(self, slot, block, handler):
+        self.blocks_scanned += 1
+        if not block.transactions:
+            return
+
+        for tx in block.transactions:
+            self.transactions_scanned += 1
+
+            # Static account keys plus keys loaded from address lookup tables
+            account_keys = list(tx.transaction.message.account_keys)
+            loaded_addresses = tx.meta.loaded_addresses if tx.meta else None
+            if loaded_addresses:
+                account_keys += list(loaded_addresses.writable) + list(loaded_addresses.readonly)
+
+            for account_key in account_keys:
+                wallet_address = self.watched.get(account_key)
+                if wallet_address is None:
+                    continue
+
+                # Wrap the block transaction like a getTransaction response so it parses the same way
+                details = TransactionDetails(GetTransactionResp(
+                    EncodedConfirmedTransactionWithStatusMeta(slot, tx, block.block_time)
+                ))
+                await handler(wallet_address, details.signature, slot, details)
+                break
+
+    def metrics(self):
+        return {
+            "blocks_scanned": self.blocks_scanned,
+            "block_transactions_scanned": self.transactions_scanned,
+            "block_retries": self.block_retries,
+            "blocks_failed": len(self.failed_slots),
+            "failed_slots": self.failed_slots,
+        }
@@ -0,0 +1,65 @@
+from urllib.parse import urlsplit
+
+import httpx
+from solana.rpc.async_api import AsyncClient
+
+from CONSTANTS import (
+    HTTP_TIMEOUT, HTTP_CONNECT_TIMEOUT, HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_KEEPALIVE_EXPIRY, HTTP_CONNECT_RETRIES
+)
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+clients = {}  # origin -> httpx.AsyncClient
+
+
+def get_http_client(url) -> httpx.AsyncClient:
+    """
+    Shared keep-alive async client for the host of url.
+
+    Each host gets its own connection pool capped at HTTP_MAX_CONNECTIONS_PER_HOST,
+    and every coroutine talking to that host reuses its connections.
+    """
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+
+    client = clients.get(origin)
+    if client is None:
+        client = clients[origin] = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=HTTP_CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+
+    return client
+
+
+async def async_rpc_client(endpoint) -> AsyncClient:
+    """
+    Solana RPC client that sends its requests through the shared client of the endpoint host
+    """
+    client = AsyncClient(endpoint)
+    await client.close()
+    client._provider.session = get_http_client(endpoint)
+    return client
+
+
+async def close_http_clients():
+    """
+    Close every shared client and its pooled connections
+    """
+    for client in clients.values():
+        await client.aclose()
+    clients.clear()
@@ -1,81 +1,284 @@
-from solana.rpc.websocket_api import connect, RpcTransactionLogsFilterMentions, Pubkey
-from CONSTANTS import WS_ENDPOINT
+from solana.rpc.websocket_api import connect, RpcTransactionLogsFilterMentions, Pubkey, SubscriptionError
+from solders.rpc.config import RpcTransactionLogsConfig
+from solders.rpc.requests import LogsSubscribe
+from solders.rpc.responses import LogsNotification, SubscriptionResult
+from solders.commitment_config import CommitmentLevel
+from websockets.exceptions import ConnectionClosed
+from CONSTANTS import (
+    WS_ENDPOINT, SUBSCRIBE_TIMEOUT, PING_INTERVAL, PING_TIMEOUT, RECONNECT_BASE_DELAY, RECONNECT_MAX_DELAY,
+    PROCESSED, CONFIRMED, FINALIZED
+)
 import asyncio
+import time
 
 
 class SolanaLogsSubscriber:
     """
-    WebSocket client to subscribe to Solana real-time logs
+    WebSocket client to subscribe to Solana real-time logs of many wallets over one connection.
+
+    The connection is supervised: keepalive pings detect dead sockets, and a dropped
+    connection is re-established with exponential backoff and every wallet is
+    resubscribed. `on_reconnect(wallet_addresses)` is called afterwards so the caller
+    can backfill what was missed while disconnected.
     """
 
-    def __init__(self, network="devnet"):
+    COMMITMENT = {
+        PROCESSED: CommitmentLevel.Processed,
+        CONFIRMED: CommitmentLevel.Confirmed,
+        FINALIZED: CommitmentLevel.Finalized,
+    }
+
+    def __init__(self, network="devnet", commitment=FINALIZED):
         self.ws_endpoint = WS_ENDPOINT[network]
+        self.commitment = commitment
 
         self.websocket = None
-        self.subscription_id = None
+        self.listen_task = None
+        self.closing = False
+        self.on_reconnect = None  # async callback(wallet_addresses) run after resubscribing
+        self.backfill_task = None
+
+        self.subscriptions = {}  # subscription id -> wallet address
+        self.wallet_subscriptions = {}  # wallet address -> subscription id
+        self.handlers = {}  # wallet address -> async handler(wallet_address, signature, slot)
+        self.pending_requests = {}  # request id -> (wallet address, future resolved with the subscription id)
+
+        # Connection health metrics
+        self.reconnects = 0
+        self.last_recovery_seconds = None
+        self.total_downtime_seconds = 0.0
+        self.listen_errors = 0
+
+    async def __open(self):
+        self.websocket = await connect(self.ws_endpoint, ping_interval=PING_INTERVAL, ping_timeout=PING_TIMEOUT)
 
     async def connect(self):
         """
-        Connect to WebSocket
+        Connect to WebSocket and start dispatching incoming messages
         """
         print("\nCONNECT TO WEBSOCKET")
         print("-" * 30)
         print(f"URL: {self.ws_endpoint}")
 
         try:
-            self.websocket = await connect(self.ws_endpoint)
+            await self.__open()
+            self.listen_task = asyncio.create_task(self.listen())
             print("Connected to WebSocket successfully!")
             return True
         except Exception as e:
             print(f"Failed to connect to WebSocket: {e}")
             return False
 
-    async def subscribe_wallet_logs(self, wallet_address):
+    async def __send_subscribe(self, wallet_address):
+        # The confirmation arrives through listen(), matched by request id
+        request_id = self.websocket.increment_counter_and_get_id()
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request_id] = (wallet_address, future)
+
+        try:
+            await self.websocket.send_data(LogsSubscribe(
+                RpcTransactionLogsFilterMentions(Pubkey.from_string(wallet_address)),
+                RpcTransactionLogsConfig(self.COMMITMENT[self.commitment]),
+                request_id,
+            ))
+        except Exception:
+            self.pending_requests.pop(request_id, None)
+            raise
+
+        return request_id, future
+
+    async def subscribe_wallet_logs(self, wallet_address, handler):
+        """
+        Subscribe to wallet logs, notifications of this wallet are passed to handler
+        """
+        return (await self.subscribe_wallets([wallet_address], handler))[wallet_address]
+
+    async def subscribe_wallets(self, wallet_addresses, handler) -> dict:
         """
-        Subscribe to wallet logs
+        Subscribe to the logs of many wallets, returning {wallet address: subscribed}.
+
+        Every logsSubscribe request is sent first and the confirmations are awaited
+        together, so subscribing N wallets costs one round trip instead of N.
         """
         print(f"\nSUBSCRIBE TO WALLET LOGS")
         print("-" * 40)
-        print(f"Wallet: {wallet_address}")
+
+        results = {}
+        requests = {}  # wallet address -> (request id, future)
+        for wallet_address in dict.fromkeys(wallet_addresses):
+            if wallet_address in self.wallet_subscriptions:
+                print(f"Wallet {wallet_address} is already subscribed.")
+                results[wallet_address] = True
+                continue
+
+            self.handlers[wallet_address] = handler
+            try:
+                requests[wallet_address] = await self.__send_subscribe(wallet_address)
+            except Exception as e:
+                self.handlers.pop(wallet_address, None)
+                print(f"Failed to subscribe to logs of {wallet_address}: {e}")
+                results[wallet_address] = False
+
+        confirmations = await asyncio.gather(
+            *(asyncio.wait_for(future, timeout=SUBSCRIBE_TIMEOUT) for _, future in requests.values()),
+            return_exceptions=True,
+        )
+        for (wallet_address, (request_id, _)), subscription_id in zip(requests.items(), confirmations):
+            if isinstance(subscription_id, BaseException):
+                self.pending_requests.pop(request_id, None)
+                self.handlers.pop(wallet_address, None)
+                print(f"Failed to subscribe to logs of {wallet_address}: {subscription_id!r}")
+                results[wallet_address] = False
+            else:
+                print(f"Subscribed to logs of {wallet_address} (subscription ID: {subscription_id})")
+                results[wallet_address] = True
+
+        print(f"{sum(results.values())}/{len(results)} wallets subscribed")
+        return results
+
+    async def unsubscribe_wallet_logs(self, wallet_address):
+        """
+        Stop receiving logs of a wallet, other subscriptions stay on the same connection
+        """
+        # Drop routing first so late notifications of this wallet are ignored
+        handler = self.handlers.pop(wallet_address, None)
+        subscription_id = self.wallet_subscriptions.pop(wallet_address, None)
+        if subscription_id is None:
+            if handler is None:
+                print(f"Wallet {wallet_address} is not subscribed.")
+                return False
+            return True
+
+        self.subscriptions.pop(subscription_id, None)
 
         try:
-            await self.websocket.logs_subscribe(
-                filter_=RpcTransactionLogsFilterMentions(
-                    Pubkey.from_string(wallet_address)
-                ),
-                commitment="finalized"
-            )
-            print("Subscribed to wallet logs successfully!")
-            first_resp = await self.websocket.recv()
-            self.subscription_id = first_resp[0].result
-            print(f"Subscription ID: {self.subscription_id}")
+            await self.websocket.logs_unsubscribe(subscription_id)
+            print(f"Unsubscribed wallet {wallet_address} (subscription ID: {subscription_id})")
             return True
         except Exception as e:
-            print(f"Failed to subscribe to wallet logs: {e}")
+            print(f"Failed to unsubscribe wallet {wallet_address}: {e}")
             return False
 
-    async def get_latest_signature(self):
+    async def __reconnect(self):
         """
-        Get latest signature from WebSocket
+        Reconnect with exponential backoff and resubscribe every wallet
         """
-        try:
-            msg = await self.websocket.recv()
-            if msg is None:
-                return None
-            return msg[0].result.value.signature
-        except (asyncio.CancelledError, KeyboardInterrupt):
-            raise asyncio.CancelledError
-        except Exception as e:
-            print(f"Failed to get latest signature: {e}")
-            return None
+        disconnected_at = time.monotonic()
+        delay = RECONNECT_BASE_DELAY
+
+        # Subscription ids of the old connection are no longer valid
+        self.subscriptions.clear()
+        self.wallet_subscriptions.clear()
+        for _, future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("WebSocket connection lost"))
+        self.pending_requests.clear()
+
+        while True:
+            print(f"Reconnecting to WebSocket in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+            try:
+                await self.__open()
+                # Confirmations are resolved by listen() once it resumes reading
+                for wallet_address in list(self.handlers):
+                    await self.__send_subscribe(wallet_address)
+                break
+            except Exception as e:
+                print(f"Reconnect failed: {e}")
+                self.pending_requests.clear()
+                if self.websocket and not self.websocket.closed:
+                    await self.websocket.close()
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+        self.reconnects += 1
+        self.last_recovery_seconds = time.monotonic() - disconnected_at
+        self.total_downtime_seconds += self.last_recovery_seconds
+        print(f"Reconnected and resubscribed {len(self.handlers)} wallets after {self.last_recovery_seconds:.1f} seconds")
+
+        if self.on_reconnect and self.handlers:
+            # Backfill in the background so the socket keeps being read
+            self.backfill_task = asyncio.create_task(self.on_reconnect(list(self.handlers)))
+
+    async def listen(self):
+        """
+        Read every message from the WebSocket and route it by subscription id
+        """
+        while True:
+            try:
+                messages = await self.websocket.recv()
+            except SubscriptionError as e:
+                # A rejected subscribe request fails the subscribe_wallet_logs call waiting for it
+                _, future = self.pending_requests.pop(e.subscription.id, (None, None))
+                if future and not future.done():
+                    future.set_exception(e)
+                continue
+            except (ConnectionClosed, OSError) as e:
+                if self.closing:
+                    return
+                print(f"WebSocket connection lost: {e}")
+                await self.__reconnect()
+                continue
+            except Exception as e:
+                if self.closing:
+                    return
+                # Anything else, e.g. a message solders cannot parse, must not end the listener. The
+                # message is lost, so start over on a fresh connection and let the backfill recover it.
+                self.listen_errors += 1
+                print(f"Unexpected WebSocket error, reconnecting: {e!r}")
+                try:
+                    await self.websocket.close()
+                except Exception:
+                    pass
+                await self.__reconnect()
+                continue
+
+            for message in messages:
+                if isinstance(message, SubscriptionResult):
+                    wallet_address, future = self.pending_requests.pop(message.id, (None, None))
+                    if wallet_address is None or wallet_address not in self.handlers:
+                        continue
+
+                    self.subscriptions[message.result] = wallet_address
+                    self.wallet_subscriptions[wallet_address] = message.result
+                    if not future.done():
+                        future.set_result(message.result)
+
+                elif isinstance(message, LogsNotification):
+                    wallet_address = self.subscriptions.get(message.subscription)
+                    handler = self.handlers.get(wallet_address)
+                    if handler is None:
+                        continue
+
+                    try:
+                        await handler(wallet_address, message.result.value.signature, message.result.context.slot)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        print(f"Error handling notification for {wallet_address}: {e}")
+
+    def metrics(self):
+        """
+        Connection health metrics
+        """
+        return {
+            "reconnects": self.reconnects,
+            "last_recovery_seconds": self.last_recovery_seconds,
+            "total_downtime_seconds": self.total_downtime_seconds,
+            "listen_errors": self.listen_errors,
+        }
 
     async def close(self):
         """
         Close WebSocket
         """
+        self.closing = True
         try:
-            await self.websocket.logs_unsubscribe(self.subscription_id)
-            print(f"Unsubscribed from subscription ID: {self.subscription_id}")
+            for wallet_address in list(self.handlers):
+                await self.unsubscribe_wallet_logs(wallet_address)
+
+            if self.listen_task:
+                self.listen_task.cancel()
+
             await self.websocket.close()
             print("Closed WebSocket connection")
         except Exception as e:
@@ -1,5 +1,6 @@
 import asyncio
 from wallet_monitor import SolanaWalletMonitor
+from CONSTANTS import DEDUP_CHECKPOINT_PATH, COMMITMENT_LEVELS, FINALIZED, INGESTION_MODES, LOGS
 
 
 async def main():
@@ -31,23 +32,39 @@ async def main():
         network = "devnet"
         print("Invalid network choice. Defaulting to Devnet")
 
-    monitor = SolanaWalletMonitor(network)
+    # Commitment selection
+    commitment = input(
+        "\nCommitment level (processed/confirmed/finalized, default finalized): ").strip().lower() or FINALIZED
+    if commitment not in COMMITMENT_LEVELS:
+        commitment = FINALIZED
+        print("Invalid commitment. Defaulting to finalized")
+
+    # Ingestion selection
+    ingestion = input(
+        "\nIngestion mode (logs/blocks, default logs): ").strip().lower() or LOGS
+    if ingestion not in INGESTION_MODES:
+        ingestion = LOGS
+        print("Invalid ingestion mode. Defaulting to logs")
+
+    monitor = SolanaWalletMonitor(network, checkpoint_path=DEDUP_CHECKPOINT_PATH, commitment=commitment,
+                                  ingestion=ingestion)
 
     try:
         if not await monitor.connect():
-            print("Cannot connect to WebSocket")
+            print("Cannot connect to Solana endpoints")
             return
 
-        wallet = input("\nEnter wallet address to monitor: ").strip()
+        wallets = input("\nEnter wallet addresses to monitor (comma separated): ").strip()
+        wallets = [wallet.strip() for wallet in wallets.split(",") if wallet.strip()]
 
-        if not wallet:
+        if not wallets:
             raise ValueError("Wallet address is required")
 
         max_tx = input("Number of transactions (enter to watch unlimited): ").strip()
         max_tx = int(max_tx) if max_tx.isdigit() else None
 
         try:
-            await monitor.monitor_wallet(wallet, max_tx)
+            await monitor.monitor_wallets(wallets, max_tx)
         except (asyncio.CancelledError, KeyboardInterrupt):
             print("Monitoring stopped by user (Ctrl+C). Cleaning up...")
 
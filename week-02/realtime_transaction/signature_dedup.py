@@ -0,0 +1,136 @@
+import base64
+import json
+import math
+import os
+
+
+class SignatureDeduplicator:
+    """
+    Fixed-memory "seen recently?" check for transaction signatures.
+
+    Two Bloom filters rotate: new signatures go into the current generation, lookups
+    check both. The current generation is retired once it holds `capacity` signatures
+    or spans `window_slots` slots, so every signature is remembered for at least one
+    full window and memory never grows. Signatures are ed25519 outputs, so the raw
+    64 bytes are already uniformly random and are sliced into the bit positions
+    directly instead of being hashed again.
+    """
+
+    MAX_HASHES = 8  # 64-byte signature / 8 bytes per position
+
+    def __init__(self, window_slots=1500, capacity=100_000, false_positive_rate=1e-6):
+        if capacity <= 0 or not 0 < false_positive_rate < 1:
+            raise ValueError("Capacity must be positive and false positive rate between 0 and 1")
+
+        self.window_slots = window_slots
+        self.capacity = capacity
+        self.target_false_positive_rate = false_positive_rate
+
+        # Optimal Bloom filter size for `capacity` items at the target rate (per generation)
+        self.bits = max(64, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        if self.hashes > self.MAX_HASHES:
+            # Fewer positions than optimal, grow the filter to keep the target rate
+            self.hashes = self.MAX_HASHES
+            self.bits = math.ceil(-self.hashes * capacity / math.log(1 - false_positive_rate ** (1 / self.hashes)))
+
+        self.current = bytearray((self.bits + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self.current_count = 0
+        self.current_start_slot = None
+
+    def __positions(self, raw):
+        for i in range(self.hashes):
+            yield int.from_bytes(raw[i * 8:(i + 1) * 8], "little") % self.bits
+
+    @staticmethod
+    def __contains(bitmap, positions):
+        return all(bitmap[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def __rotate(self):
+        self.previous = self.current
+        self.current = bytearray(len(self.previous))
+        self.current_count = 0
+        self.current_start_slot = None
+
+    def seen_or_add(self, signature, slot=None) -> bool:
+        """
+        Return True if the signature was seen within the window, otherwise remember it
+        """
+        raw = bytes(signature)
+        positions = list(self.__positions(raw))
+
+        if self.__contains(self.current, positions) or self.__contains(self.previous, positions):
+            return True
+
+        if self.current_count >= self.capacity or (
+            slot is not None and self.current_start_slot is not None
+            and slot - self.current_start_slot >= self.window_slots
+        ):
+            self.__rotate()
+
+        for position in positions:
+            self.current[position >> 3] |= 1 << (position & 7)
+        self.current_count += 1
+        if self.current_start_slot is None:
+            self.current_start_slot = slot
+
+        return False
+
+    def false_positive_rate(self) -> float:
+        """
+        False positive rate measured from the bits actually set in both generations
+        """
+        def filter_rate(bitmap):
+            fill_ratio = sum(bin(byte).count("1") for byte in bitmap) / self.bits
+            return fill_ratio ** self.hashes
+
+        return 1 - (1 - filter_rate(self.current)) * (1 - filter_rate(self.previous))
+
+    def memory_bytes(self) -> int:
+        return len(self.current) + len(self.previous)
+
+    def save(self, path):
+        """
+        Checkpoint both generations to disk (atomic replace)
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        state = {
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "current_count": self.current_count,
+            "current_start_slot": self.current_start_slot,
+            "current": base64.b64encode(self.current).decode(),
+            "previous": base64.b64encode(self.previous).decode(),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path) -> bool:
+        """
+        Restore a checkpoint written with the same configuration
+        """
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable dedup checkpoint {path}: {e}")
+            return False
+
+        if state.get("bits") != self.bits or state.get("hashes") != self.hashes:
+            print(f"Ignoring dedup checkpoint {path}: written with a different configuration")
+            return False
+
+        self.current = bytearray(base64.b64decode(state["current"]))
+        self.previous = bytearray(base64.b64decode(state["previous"]))
+        self.current_count = state["current_count"]
+        self.current_start_slot = state["current_start_slot"]
+        return True
@@ -1,57 +1,82 @@
-from typing import Optional, Dict, List, Any
+from typing import Optional, List
+from array import array
 from datetime import datetime
+from operator import sub
 from solders.signature import Signature
-from solana.rpc.async_api import AsyncClient
-from CONSTANTS import RPC_ENDPOINT
-from dataclasses import dataclass
+from solders.pubkey import Pubkey
+from http_client import async_rpc_client
+from CONSTANTS import RPC_ENDPOINT, PROCESSED, CONFIRMED, FINALIZED, LAMPORTS_PER_SOL
 from solana.rpc.async_api import GetTransactionResp
 
 
-@dataclass
-class TransactionDetails:
+def format_sol(lamports: int, signed: bool = False) -> str:
     """
-    Structured data class to hold parsed transaction information
+    Format an exact lamport amount as SOL with 9 decimals, without going through float
     """
+    sign = "-" if lamports < 0 else ("+" if signed else "")
+    whole, fraction = divmod(abs(lamports), LAMPORTS_PER_SOL)
+    return f"{sign}{whole}.{fraction:09d}"
 
-    signature: Signature  # signature of the transaction from logs
-    timestamp: str  # transaction time (UTC)
-    slot: int  # transaction slot
-    fee_sol: float  # transaction fee in SOL
-    status: str  # "SUCCESS" or "FAILED" to indicate transaction status
 
-    # account information related to the transaction
-    account_keys: List[str]
+class TransactionDetails:
+    """
+    Parsed transaction information, kept compact for the monitor hot path.
+
+    Lamport amounts are exact integers in arrays indexed like the account keys, and the
+    account keys stay raw 32-byte keys until one is displayed.
+    """
 
-    # list of balance changes for the related accounts
-    balance_changes: List[Dict[str, Any]]
+    __slots__ = (
+        "signature",  # signature of the transaction from logs
+        "block_time",  # unix time of the block, None if unknown
+        "slot",  # transaction slot
+        "fee",  # transaction fee in lamports
+        "status",  # "SUCCESS" or "FAILED" to indicate transaction status
+        "raw_account_keys",  # static keys followed by lookup table keys, 32 bytes each
+        "pre_balances",  # lamports before the transaction, per account key
+        "post_balances",  # lamports after the transaction, per account key
+        "balance_deltas",  # post - pre, per account key
+    )
 
     def __init__(self, tx: GetTransactionResp) -> None:
-        self.signature = tx.value.transaction.transaction.signatures[0]
-        self.timestamp = datetime.fromtimestamp(
-            tx.value.block_time).strftime('%Y-%m-%d %H:%M:%S')
+        transaction = tx.value.transaction
+        meta = transaction.meta
+
+        self.signature = transaction.transaction.signatures[0]
+        self.block_time = tx.value.block_time
         self.slot = tx.value.slot
-        self.fee_sol = tx.value.transaction.meta.fee / 1e9
-        self.status = "SUCCESS" if tx.value.transaction.meta.err is None else "FAILED"
-        self.account_keys = [account_key.__str__(
-        ) for account_key in tx.value.transaction.transaction.message.account_keys]
-
-        # Calculate balance changes
-        pre_balances = tx.value.transaction.meta.pre_balances
-        post_balances = tx.value.transaction.meta.post_balances
-        self.balance_changes = []
-
-        for i, account_key in enumerate(self.account_keys):
-            if i < len(pre_balances) and i < len(post_balances):
-                pre_balance = pre_balances[i] / 1e9
-                post_balance = post_balances[i] / 1e9
-                change = post_balance - pre_balance
-
-                self.balance_changes.append({
-                    "account": account_key,
-                    "pre_balance": pre_balance,
-                    "post_balance": post_balance,
-                    "change": change
-                })
+        self.fee = meta.fee
+        self.status = "SUCCESS" if meta.err is None else "FAILED"
+
+        # Balances of versioned transactions also cover the keys loaded from lookup tables
+        account_keys = list(transaction.transaction.message.account_keys)
+        if meta.loaded_addresses:
+            account_keys += list(meta.loaded_addresses.writable) + list(meta.loaded_addresses.readonly)
+
+        count = min(len(account_keys), len(meta.pre_balances), len(meta.post_balances))
+        self.raw_account_keys = b"".join(bytes(account_key) for account_key in account_keys[:count])
+        self.pre_balances = array("Q", meta.pre_balances[:count])
+        self.post_balances = array("Q", meta.post_balances[:count])
+        self.balance_deltas = array("q", map(sub, self.post_balances, self.pre_balances))
+
+    @property
+    def timestamp(self) -> str:
+        """
+        Transaction time (UTC)
+        """
+        if self.block_time is None:
+            return "unknown"
+        return datetime.fromtimestamp(self.block_time).strftime('%Y-%m-%d %H:%M:%S')
+
+    @property
+    def fee_sol(self) -> float:
+        return self.fee / LAMPORTS_PER_SOL
+
+    def account_key(self, index: int) -> str:
+        """
+        Base58 address of the account key at index
+        """
+        return str(Pubkey.from_bytes(self.raw_account_keys[index * 32:(index + 1) * 32]))
 
 
 class SolanaTransactionDetailsFetcher:
@@ -59,10 +84,13 @@ class SolanaTransactionDetailsFetcher:
     HTTP client to fetch transaction details from signature
     """
 
-    def __init__(self, network="devnet"):
+    def __init__(self, network="devnet", commitment=FINALIZED):
         self.network = network
         self.rpc_endpoint = RPC_ENDPOINT[network]
 
+        # getTransaction does not serve processed transactions, confirmed is the fastest it offers
+        self.commitment = CONFIRMED if commitment == PROCESSED else commitment
+
     async def connect(self):
         """
         Connect to RPC endpoint
@@ -72,7 +100,7 @@ class SolanaTransactionDetailsFetcher:
         print(f"URL: {self.rpc_endpoint}")
 
         try:
-            self.client = AsyncClient(self.rpc_endpoint)
+            self.client = await async_rpc_client(self.rpc_endpoint)
             print("Connected to RPC endpoint successfully!")
             return True
         except Exception as e:
@@ -88,7 +116,7 @@ class SolanaTransactionDetailsFetcher:
             tx_response = await self.client.get_transaction(
                 tx_sig=signature, 
                 max_supported_transaction_version=0,
-                commitment="finalized" # Explicitly set commitment
+                commitment=self.commitment # Explicitly set commitment
             )
             
             if tx_response is None:
@@ -96,11 +124,73 @@ class SolanaTransactionDetailsFetcher:
                 return None
 
             if tx_response.value is None:
-                print(f"Transaction data not available. It might not be finalized or may not exist.")
+                print(f"Transaction data not available. It might not be {self.commitment} yet or may not exist.")
             else:
                 print(f"Transaction raw data retrieved successfully.")
             
             return tx_response
         except Exception as e:
             print(f"Error fetching transaction details for {signature}: {e}\n")
-            return None
\ No newline at end of file
+            return None
+
+    async def get_signatures_for_address(self, wallet_address: str, before: Optional[Signature] = None,
+                                         until: Optional[Signature] = None, limit: int = 1000) -> Optional[List]:
+        """
+        Get one page of signatures of a wallet (newest first)
+        """
+        try:
+            response = await self.client.get_signatures_for_address(
+                Pubkey.from_string(wallet_address),
+                before=before,
+                until=until,
+                limit=limit,
+                commitment=self.commitment
+            )
+            return response.value
+        except Exception as e:
+            print(f"Error fetching signatures for {wallet_address}: {e}\n")
+            return None
+
+    async def get_signature_statuses(self, signatures: List[Signature]) -> Optional[List]:
+        """
+        Get the current confirmation status of up to 256 signatures in one call
+        """
+        try:
+            response = await self.client.get_signature_statuses(signatures)
+            return response.value
+        except Exception as e:
+            print(f"Error fetching signature statuses: {e}\n")
+            return None
+
+    async def get_slot(self) -> Optional[int]:
+        """
+        Get the newest finalized slot
+        """
+        try:
+            response = await self.client.get_slot(commitment=FINALIZED)
+            return response.value
+        except Exception as e:
+            print(f"Error fetching slot: {e}\n")
+            return None
+
+    async def get_blocks(self, start_slot: int, end_slot: int) -> Optional[List[int]]:
+        """
+        Get the slots between start_slot and end_slot (inclusive) that produced a finalized block
+        """
+        try:
+            response = await self.client.get_blocks(start_slot, end_slot)
+            return response.value
+        except Exception as e:
+            print(f"Error fetching blocks {start_slot}-{end_slot}: {e}\n")
+            return None
+
+    async def get_block(self, slot: int):
+        """
+        Get a finalized block with all of its transactions and their metadata
+        """
+        try:
+            response = await self.client.get_block(slot, encoding="json", max_supported_transaction_version=0)
+            return response.value
+        except Exception as e:
+            print(f"Error fetching block {slot}: {e}\n")
+            return None
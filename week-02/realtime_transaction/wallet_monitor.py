@@ -1,7 +1,18 @@
 import asyncio
-from datetime import datetime
-from transaction_details import TransactionDetails, SolanaTransactionDetailsFetcher
+import time
+from solders.transaction_status import TransactionConfirmationStatus
+from transaction_details import TransactionDetails, SolanaTransactionDetailsFetcher, format_sol
 from logs_subscriber import SolanaLogsSubscriber
+from block_stream import SolanaBlockStream
+from rate_limiter import AsyncTokenBucket
+from signature_dedup import SignatureDeduplicator
+from http_client import close_http_clients
+from CONSTANTS import (
+    RPC_RATE_LIMIT, FETCH_WORKERS, RENDER_WINDOW, DETAILS_MAX_RETRIES, DETAILS_RETRY_DELAY,
+    DEDUP_WINDOW_SLOTS, DEDUP_CAPACITY, DEDUP_FALSE_POSITIVE_RATE, DEDUP_CHECKPOINT_INTERVAL, BACKFILL_PAGE_LIMIT,
+    COMMITMENT_LEVELS, FINALIZED, FINALITY_POLL_INTERVAL, FINALITY_TIMEOUT, FINALITY_DRAIN_MARGIN, SIGNATURE_STATUSES_LIMIT,
+    INGESTION_MODES, LOGS, BLOCKS
+)
 
 
 class SolanaWalletMonitor:
@@ -9,174 +20,455 @@ class SolanaWalletMonitor:
     Wallet's real-time transaction monitor
     """
 
-    def __init__(self, network="devnet"):
+    def __init__(self, network="devnet", workers=FETCH_WORKERS, render_order="arrival", checkpoint_path=None,
+                 commitment=FINALIZED, ingestion=LOGS):
+        if render_order not in ("arrival", "slot"):
+            raise ValueError("Render order must be 'arrival' or 'slot'")
+        if commitment not in COMMITMENT_LEVELS:
+            raise ValueError(f"Commitment must be one of {', '.join(COMMITMENT_LEVELS)}")
+        if ingestion not in INGESTION_MODES:
+            raise ValueError(f"Ingestion must be one of {', '.join(INGESTION_MODES)}")
+
+        # getBlock is only served for finalized blocks by the RPC client
+        if ingestion == BLOCKS and commitment != FINALIZED:
+            print(f"→ Block ingestion scans finalized blocks, ignoring commitment {commitment}")
+            commitment = FINALIZED
+
         self.network = network
+        self.workers = workers
+        self.render_order = render_order
+        self.commitment = commitment
+        self.ingestion = ingestion
 
         # Initialize components
-        self.logs_subscriber = SolanaLogsSubscriber(network)
-        self.details_fetcher = SolanaTransactionDetailsFetcher(network)
+        self.logs_subscriber = SolanaLogsSubscriber(network, commitment)
+        self.details_fetcher = SolanaTransactionDetailsFetcher(network, commitment)
+        self.limiter = AsyncTokenBucket(RPC_RATE_LIMIT[network])
+        self.block_stream = SolanaBlockStream(self.details_fetcher, self.limiter)
+        self.block_task = None
+
+        # After a reconnect, fetch what was missed while the WebSocket was down
+        self.logs_subscriber.on_reconnect = self.__backfill
+        self.last_signatures = {}  # wallet address -> (signature, slot) of the newest accepted notification
+        self.backfilled_signatures = 0
+
+        # Fixed-memory record of recently processed signatures, optionally restored from disk
+        self.processed_signatures = SignatureDeduplicator(DEDUP_WINDOW_SLOTS, DEDUP_CAPACITY, DEDUP_FALSE_POSITIVE_RATE)
+        self.checkpoint_path = checkpoint_path
+        if checkpoint_path and self.processed_signatures.load(checkpoint_path):
+            print(f"→ Restored processed signatures from {checkpoint_path}")
+
+        self.transaction_count = 0  # Signatures accepted into the pipeline
+        self.rendered_count = 0  # Results displayed
+        self.max_transactions = None
+        self.done = None
+        self.signature_queue = None
+        self.result_queue = None
 
-        self.processed_signatures = set()
+        # Transactions reported before finalization: signature -> (wallet address, reported at, summary number)
+        self.provisional = {}
+        self.finalized_count = 0
+        self.retracted_count = 0
+        self.unsettled_count = 0
 
         print(f"→ Network: {network}")
+        print(f"→ Commitment: {commitment}")
+        print(f"→ Ingestion: {ingestion}")
 
     # Connect WebSocket and RPC endpoint
     async def connect(self):
         """
         Connect WebSocket and RPC endpoint
         """
+        # Block ingestion only talks to the RPC endpoint
+        if self.ingestion == BLOCKS:
+            return await self.details_fetcher.connect()
         return await self.logs_subscriber.connect() and await self.details_fetcher.connect()
 
+    # Add or remove wallets at runtime, all of them share one WebSocket connection
+    async def add_wallet(self, wallet_address: str):
+        """
+        Start monitoring another wallet
+        """
+        return (await self.add_wallets([wallet_address]))[wallet_address]
+
+    async def add_wallets(self, wallet_addresses: list) -> dict:
+        """
+        Start monitoring several wallets at once, returning {wallet address: added}
+        """
+        if self.ingestion == BLOCKS:
+            for wallet_address in wallet_addresses:
+                self.block_stream.watch(wallet_address)
+            return {wallet_address: True for wallet_address in wallet_addresses}
+        return await self.logs_subscriber.subscribe_wallets(wallet_addresses, self.__handle_signature)
+
+    async def remove_wallet(self, wallet_address: str):
+        """
+        Stop monitoring a wallet
+        """
+        if self.ingestion == BLOCKS:
+            self.block_stream.unwatch(wallet_address)
+            return True
+        return await self.logs_subscriber.unsubscribe_wallet_logs(wallet_address)
+
     # Monitor incoming transactions of a wallet
     async def monitor_wallet(self, wallet_address: str, max_transactions: int = None):
         """
         Monitor wallet with real-time analysis
         """
+        await self.monitor_wallets([wallet_address], max_transactions)
+
+    # Monitor incoming transactions of many wallets
+    async def monitor_wallets(self, wallet_addresses: list, max_transactions: int = None):
+        """
+        Monitor wallets with real-time analysis over a single WebSocket connection.
+
+        Processing is a three stage pipeline: the WebSocket listener only queues new
+        signatures, a bounded pool of workers fetches details under the shared rate
+        limiter, and a renderer prints results in arrival or slot order.
+
+        With block ingestion the first two stages are replaced by the block stream: each
+        finalized block is fetched once and matching transactions go straight to the renderer.
+        """
         print(f"\n{'='*60}")
-        print(f"START MONITORING WALLET")
+        print(f"START MONITORING WALLETS")
         print(f"{'='*60}")
-        print(f"Target wallet: {wallet_address}")
+        print(f"Target wallets: {', '.join(wallet_addresses)}")
         print(f"Number of transactions: {max_transactions if max_transactions is not None else 'infinite'}")
+        print(f"Ingestion: {self.ingestion}, fetch workers: {self.workers}, render order: {self.render_order}")
         print(f"{'='*60}")
 
-        # Subscribe to wallet logs
-        if not await self.logs_subscriber.subscribe_wallet_logs(wallet_address):
-            return
+        self.max_transactions = max_transactions
+        self.done = asyncio.Event()
+        self.signature_queue = asyncio.Queue()
+        self.result_queue = asyncio.Queue()
+
+        # Subscribe to logs of every wallet
+        await self.add_wallets(wallet_addresses)
+
+        if self.ingestion == BLOCKS:
+            if not self.block_stream.watched:
+                return
+            self.block_task = asyncio.create_task(self.block_stream.run(self.__handle_block_transaction))
+            source_task = self.block_task
+            tasks = [self.block_task]
+        else:
+            if not self.logs_subscriber.wallet_subscriptions:
+                return
+            source_task = self.logs_subscriber.listen_task
+            tasks = [asyncio.create_task(self.__fetch_worker()) for _ in range(self.workers)]
 
         print("Waiting for transactions...")
         print("-" * 60)
 
-        transaction_count = 0
+        tasks.append(asyncio.create_task(self.__render_results()))
+        finality_task = None
+        if self.commitment != FINALIZED:
+            finality_task = asyncio.create_task(self.__track_finality())
+            tasks.append(finality_task)
+
+        # Wait until enough transactions were rendered or the connection ended
+        done_task = asyncio.create_task(self.done.wait())
+        try:
+            await asyncio.wait([done_task, source_task], return_when=asyncio.FIRST_COMPLETED)
+
+            # Provisional reports normally settle (finalized or retracted) within FINALITY_TIMEOUT, but not
+            # if status calls keep failing, a status stays confirmed or the tracker died: bound the wait
+            if self.provisional:
+                print(f"\nWaiting for {len(self.provisional)} provisional transactions to finalize...")
+                try:
+                    await asyncio.wait_for(self.__drain_provisional(finality_task), FINALITY_TIMEOUT + FINALITY_DRAIN_MARGIN)
+                except asyncio.TimeoutError:
+                    pass
+                self.__report_unsettled(finality_task)
+        finally:
+            done_task.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # The source only ends on its own through an error, which would otherwise never be retrieved
+        if source_task.done() and not source_task.cancelled() and source_task.exception():
+            print(f"\nMONITORING STOPPED: {self.ingestion} ingestion failed with {source_task.exception()!r}")
+        else:
+            print(f"\nMONITORING COMPLETE!")
+        print(f"Unique transactions processed: {self.rendered_count}")
+        print(f"Dedup memory: {self.processed_signatures.memory_bytes():,} bytes, "
+              f"false positive rate: {self.processed_signatures.false_positive_rate():.2e}")
+        print(f"Metrics: {self.metrics()}")
+
+    def __accept_signature(self, wallet_address: str, signature, slot: int):
+        """
+        Return the pipeline sequence number of a new signature, None if it is skipped
+        """
+        # Stop accepting once enough signatures are in the pipeline
+        if self.max_transactions is not None and self.transaction_count >= self.max_transactions:
+            return None
+
+        # Backfill cursor for this wallet
+        last = self.last_signatures.get(wallet_address)
+        if last is None or slot >= last[1]:
+            self.last_signatures[wallet_address] = (signature, slot)
+
+        # Check if the signature is already processed
+        if self.processed_signatures.seen_or_add(signature, slot):
+            return None
+
+        self.transaction_count += 1
+        if self.checkpoint_path and self.transaction_count % DEDUP_CHECKPOINT_INTERVAL == 0:
+            self.processed_signatures.save(self.checkpoint_path)
+
+        return self.transaction_count
+
+    # Stage 1: called by the WebSocket listener, must return quickly
+    async def __handle_signature(self, wallet_address: str, signature, slot: int):
+        """
+        Queue a new signature for the fetch workers, return True if it was queued
+        """
+        sequence = self.__accept_signature(wallet_address, signature, slot)
+        if sequence is None:
+            return False
+
+        self.signature_queue.put_nowait((sequence, wallet_address, signature, slot))
+        return True
+
+    # Block ingestion: details come with the block, skip the fetch workers
+    async def __handle_block_transaction(self, wallet_address: str, signature, slot: int, details: TransactionDetails):
+        """
+        Queue a transaction matched in a block for rendering, return True if it was queued
+        """
+        sequence = self.__accept_signature(wallet_address, signature, slot)
+        if sequence is None:
+            return False
+
+        self.result_queue.put_nowait((sequence, slot, wallet_address, signature, details))
+        return True
 
-        # Receive new transactions
-        while max_transactions is None or transaction_count < max_transactions:
+    async def __backfill(self, wallet_addresses: list):
+        """
+        Queue signatures that were missed while the WebSocket was disconnected
+        """
+        for wallet_address in wallet_addresses:
+            last = self.last_signatures.get(wallet_address)
+            if last is None:
+                continue
+
+            # Walk getSignaturesForAddress from the newest signature back to the last one we saw
+            missed = []
+            before = None
+            while True:
+                await self.limiter.acquire()
+                page = await self.details_fetcher.get_signatures_for_address(
+                    wallet_address, before=before, until=last[0], limit=BACKFILL_PAGE_LIMIT)
+                if not page:
+                    break
+
+                missed.extend(page)
+                if len(page) < BACKFILL_PAGE_LIMIT:
+                    break
+                before = page[-1].signature
+
+            # Oldest first, the order they would have arrived over the WebSocket
+            backfilled = 0
+            for status in reversed(missed):
+                if await self.__handle_signature(wallet_address, status.signature, status.slot):
+                    backfilled += 1
+
+            self.backfilled_signatures += backfilled
+            print(f"Backfilled {backfilled} missed transactions for {wallet_address}")
+
+    def metrics(self):
+        """
+        Monitor and connection metrics
+        """
+        source_metrics = self.block_stream.metrics() if self.ingestion == BLOCKS else self.logs_subscriber.metrics()
+        return {
+            **source_metrics,
+            "backfilled_signatures": self.backfilled_signatures,
+            "transactions_processed": self.rendered_count,
+            "finalized_after_provisional": self.finalized_count,
+            "retracted": self.retracted_count,
+            "unsettled": self.unsettled_count,
+        }
+
+    # Stage 2: fetch and parse details concurrently
+    async def __fetch_worker(self):
+        """
+        Fetch details of queued signatures, rate limited across all workers
+        """
+        while True:
+            sequence, wallet_address, signature, slot = await self.signature_queue.get()
             try:
-                # Wait for new transaction
-                signature = await self.logs_subscriber.get_latest_signature()
-                if signature is None:
-                    continue
+                details = await self.__fetch_details(signature)
+            except Exception as e:
+                print(f"Error fetching transaction details for {signature}: {e}")
+                details = None
+
+            self.result_queue.put_nowait((sequence, slot, wallet_address, signature, details))
+            self.signature_queue.task_done()
+
+    async def __fetch_details(self, signature):
+        """
+        Get transaction details with retry logic
+        """
+        for attempt in range(DETAILS_MAX_RETRIES):
+            await self.limiter.acquire()
+            tx_response = await self.details_fetcher.get_transaction_details(signature)
+
+            if tx_response and tx_response.value: # Successfully fetched with details
+                return TransactionDetails(tx_response)
+
+            # If tx_response is None (fetch error) or tx_response.value is None (no details)
+            if attempt < DETAILS_MAX_RETRIES - 1:
+                print(f"Details of {signature} not yet available, retrying (attempt {attempt + 2}/{DETAILS_MAX_RETRIES})...")
+                await asyncio.sleep(DETAILS_RETRY_DELAY)
 
-                # Check if the signature is already processed
-                if signature in self.processed_signatures:
+        return None
+
+    # Stage 3: render results in order
+    async def __render_results(self):
+        """
+        Display fetched results in arrival order, or in slot order within a short window
+        """
+        if self.render_order == "slot":
+            while True:
+                # Collect everything that finishes within the window, then render it by slot
+                batch = [await self.result_queue.get()]
+                await asyncio.sleep(RENDER_WINDOW)
+                while not self.result_queue.empty():
+                    batch.append(self.result_queue.get_nowait())
+
+                for result in sorted(batch, key=lambda result: (result[1], result[0])):
+                    self.__render_result(result)
+
+        # Workers finish out of order, hold results until every earlier one is rendered
+        pending = {}
+        next_sequence = 1
+        while True:
+            result = await self.result_queue.get()
+            pending[result[0]] = result
+            while next_sequence in pending:
+                self.__render_result(pending.pop(next_sequence))
+                next_sequence += 1
+
+    def __render_result(self, result):
+        _, _, wallet_address, signature, details = result
+        if self.done.is_set():
+            return
+
+        self.rendered_count += 1
+        print(f"\n{'='*60}")
+        if details:
+            self.__display_transaction_details(details, self.rendered_count, wallet_address)
+            if self.commitment != FINALIZED:
+                # Reported before finalization, __track_finality upgrades or retracts it later
+                print(f"Commitment: PROVISIONAL ({self.details_fetcher.commitment}), awaiting finalization")
+                self.provisional[signature] = (wallet_address, time.monotonic(), self.rendered_count)
+        else:
+            print(f"Failed to get transaction details of {signature} after {DETAILS_MAX_RETRIES} attempts. Skipping this transaction.")
+
+        if self.max_transactions is not None and self.rendered_count >= self.max_transactions:
+            self.done.set()
+
+    async def __track_finality(self):
+        """
+        Upgrade provisional transactions once finalized, retract them if their fork was dropped
+        """
+        while True:
+            await asyncio.sleep(FINALITY_POLL_INTERVAL)
+
+            signatures = list(self.provisional)
+            for i in range(0, len(signatures), SIGNATURE_STATUSES_LIMIT):
+                chunk = signatures[i:i + SIGNATURE_STATUSES_LIMIT]
+                await self.limiter.acquire()
+                statuses = await self.details_fetcher.get_signature_statuses(chunk)
+                if statuses is None:
                     continue
 
-                # Add to processed set
-                self.processed_signatures.add(signature)
-                transaction_count += 1
-
-                # Get transaction details with retry logic
-                max_retries = 3
-                retry_count = 0
-                tx_response = None # Initialize tx_response
-
-                print(f"\nRECEIVED SIGNATURE, PARSING TRANSACTION DETAILS")
-                print("-" * 50)
-                while retry_count < max_retries:
-                    tx_response = await self.details_fetcher.get_transaction_details(signature)
-                    
-                    if tx_response and tx_response.value: # Successfully fetched with details
-                        break 
-                    
-                    # If tx_response is None (fetch error) or tx_response.value is None (no details)
-                    retry_count += 1
-                    print(f"Transaction details not yet available or fetch error.")
-                    if retry_count < max_retries:
-                        print(
-                            f"Retrying to get transaction details (attempt {retry_count + 1}/{max_retries})...")
-                        await asyncio.sleep(1) # Wait 1 second before retrying
-                    else:
-                        print(f"Max retries reached.")
-
-
-                if tx_response and tx_response.value:
-                    print(f"Transaction details parsed successfully!")
-                    self.__display_transaction_details(
-                        TransactionDetails(tx_response), transaction_count)
-                    # Add delay only for mainnet
-                    if self.network == "mainnet" and (max_transactions is None or transaction_count < max_transactions):
-                        print("Waiting before processing next transaction...")
-                        await asyncio.sleep(5)
-                else:
-                    # This 'else' covers cases where tx_response is None OR tx_response.value is None after retries
-                    print(
-                        f"Failed to get transaction details after {max_retries} attempts. Skipping this transaction.")
-
-                print(f"{'='*60}")
-
-            except KeyboardInterrupt:
-                print("\nMonitoring stopped by user")
-                break
-            except asyncio.TimeoutError:
-                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Monitoring timeout")
-                break
-            except Exception as e:
-                print(f"Error during monitoring: {e}")
-                break
+                for signature, status in zip(chunk, statuses):
+                    wallet_address, reported_at, count = self.provisional[signature]
+                    if status is not None and status.confirmation_status == TransactionConfirmationStatus.Finalized:
+                        del self.provisional[signature]
+                        self.finalized_count += 1
+                        print(f"\nFINALIZED: transaction #{count} of {wallet_address} ({signature})")
+                    elif status is None and time.monotonic() - reported_at > FINALITY_TIMEOUT:
+                        # The cluster no longer knows the signature, its fork was dropped
+                        del self.provisional[signature]
+                        self.retracted_count += 1
+                        print(f"\nRETRACTED: transaction #{count} of {wallet_address} ({signature}) was dropped")
 
-        print(f"\nMONITORING COMPLETE!")
-        print(f"Unique transactions processed: {transaction_count}")
+    async def __drain_provisional(self, finality_task):
+        while self.provisional and not finality_task.done():
+            await asyncio.sleep(FINALITY_POLL_INTERVAL)
 
-    def __display_transaction_details(self, details: TransactionDetails, count: int):
+    def __report_unsettled(self, finality_task):
+        if finality_task.done() and not finality_task.cancelled() and finality_task.exception():
+            print(f"\nFinality tracking stopped: {finality_task.exception()}")
+
+        for signature, (wallet_address, _, count) in self.provisional.items():
+            self.unsettled_count += 1
+            print(f"UNSETTLED: transaction #{count} of {wallet_address} ({signature}) was not finalized before exit")
+        self.provisional.clear()
+
+    def __display_transaction_details(self, details: TransactionDetails, count: int, wallet_address: str):
         """
         Display transaction details
         """
         print(f"TRANSACTION SUMMARY #{count}")
         print("─" * 40)
+        print(f"Wallet: {wallet_address}")
         print(f"Signature: {details.signature}")
         print(f"Time: {details.timestamp}")
         print(f"Slot: {details.slot:,}")
-        print(f"Fee: {details.fee_sol:.9f} SOL")
+        print(f"Fee: {format_sol(details.fee)} SOL")
         print(f"Status: {details.status}")
 
-        # Check if this is a SOL transfer transaction
+        # Identify senders and receivers from exact lamport changes
         senders = []
         receivers = []
-
-        # Identify senders and receivers from balance changes
-        for change in details.balance_changes:
-            if change['change'] < -0.000001:
-                # Account with negative change is a sender
-                # The actual transfer amount is the change plus any fees paid
-                transfer_amount = abs(change['change'])
-                if change['account'] == details.account_keys[0]:  # Fee payer
-                    transfer_amount += details.fee_sol
-                senders.append({
-                    'account': change['account'],
-                    'amount': transfer_amount
-                })
-            elif change['change'] > 0.000001:
-                # Account with positive change is a receiver
-                receivers.append({
-                    'account': change['account'],
-                    'amount': change['change']
-                })
+        for index, delta in enumerate(details.balance_deltas):
+            if delta < 0:
+                # The fee payer's change includes the fee, which is not part of the transfer
+                amount = -delta - details.fee if index == 0 else -delta
+                if amount > 0:
+                    senders.append((index, amount))
+            elif delta > 0:
+                receivers.append((index, delta))
 
         # Display transfer details if we found any transfers
         if senders and receivers:
             print(f"\nTRANSFER DETAILS:")
             if len(senders) == 1 and len(receivers) == 1:
-                print(f"From: {senders[0]['account']}")
-                print(f"To: {receivers[0]['account']}")
-                print(f"Amount: {senders[0]['amount']:.9f} SOL")
+                print(f"From: {details.account_key(senders[0][0])}")
+                print(f"To: {details.account_key(receivers[0][0])}")
+                print(f"Amount: {format_sol(senders[0][1])} SOL")
             else:
                 print("Senders:")
-                for sender in senders:
-                    print(
-                        f"  {sender['account']} → {sender['amount']:.9f} SOL")
+                for index, amount in senders:
+                    print(f"  {details.account_key(index)} → {format_sol(amount)} SOL")
                 print("Receivers:")
-                for receiver in receivers:
-                    print(
-                        f"  {receiver['account']} ← {receiver['amount']:.9f} SOL")
+                for index, amount in receivers:
+                    print(f"  {details.account_key(index)} ← {format_sol(amount)} SOL")
 
-        if details.balance_changes:
+        if any(details.balance_deltas):
             print(f"\nBALANCE CHANGES:")
-            for change in details.balance_changes:
-                if abs(change['change']) > 0.000001:
-                    change_str = f"+{change['change']:.9f}" if change['change'] > 0 else f"{change['change']:.9f}"
-                    print(f"   {change['account']}: {change_str} SOL")
+            for index, delta in enumerate(details.balance_deltas):
+                if delta:
+                    print(f"   {details.account_key(index)}: {format_sol(delta, signed=True)} SOL")
 
     async def close(self):
         """
         Close connection
         """
-        await self.logs_subscriber.close()
+        if self.checkpoint_path:
+            self.processed_signatures.save(self.checkpoint_path)
+            print(f"Saved processed signatures to {self.checkpoint_path}")
+
+        if self.ingestion == BLOCKS:
+            if self.block_task:
+                self.block_task.cancel()
+        else:
+            await self.logs_subscriber.close()
+
+        # Release the pooled RPC connections
+        await close_http_clients()
@@ -1,7 +1,47 @@
 MAINNET_ENDPOINT = "https://api.mainnet-beta.solana.com"
 DEVNET_ENDPOINT = "https://api.devnet.solana.com"
 TESTNET_ENDPOINT = "https://api.testnet.solana.com"
-MAINNET_REST_TIME = 5
-DEVNET_REST_TIME = 1
+
+# Requests per second allowed on each endpoint (token bucket refill rate)
+RATE_LIMITS = {
+    MAINNET_ENDPOINT: 4,
+    DEVNET_ENDPOINT: 10,
+    TESTNET_ENDPOINT: 10,
+}
+DEFAULT_RATE_LIMIT = 10  # Used for custom/private endpoints
+MAX_WORKERS = 8  # Maximum concurrent transaction fetches
+BATCH_SIZE = 50  # getTransaction calls packed into one JSON-RPC batch request
+SIGNATURES_PAGE_LIMIT = 1000  # Maximum signatures returned by one getSignaturesForAddress call
+CACHE_DB_PATH = "cache/transactions.db"  # SQLite store of already fetched transactions
+HISTORY_CURSOR_DIR = "cache/cursors"  # Per-wallet cursors of interrupted fetches, resumed by the next run
+
+# Token programs scanned for token accounts, queried concurrently
+TOKEN_PROGRAM_IDS = {
+    "token": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+    "token-2022": "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb",
+}
+
 TOKEN_LIST_URL = "https://explorer.solana.com/address/"
-# TOKEN_LIST_URL = "https://raw.githubusercontent.com/allanpark/solana-token-list/refs/heads/main/src/tokens/solana.tokenlist.json"
\ No newline at end of file
+TOKEN_LIST_JSON_URL = "https://raw.githubusercontent.com/allanpark/solana-token-list/refs/heads/main/src/tokens/solana.tokenlist.json"
+TOKEN_NAME_CACHE_PATH = "cache/token_names.json"  # Persistent mint -> token name cache
+TOKEN_NAME_TTL = 7 * 24 * 60 * 60  # Seconds before a cached token name is fetched again
+TOKEN_NAME_CACHE_SIZE = 10_000  # Maximum cached token names (least recently used are evicted)
+
+# Shared HTTP clients: one keep-alive pool per host, reused by every RPC and web request
+HTTP_TIMEOUT = 30  # Seconds to wait for a response
+HTTP_CONNECT_TIMEOUT = 10  # Seconds to wait for a TCP/TLS connection
+HTTP_MAX_CONNECTIONS_PER_HOST = MAX_WORKERS  # Concurrent connections to one host, one per fetch worker
+HTTP_KEEPALIVE_EXPIRY = 60  # Seconds an idle connection is kept open
+HTTP_CONNECT_RETRIES = 3  # Retries of failed connection attempts (responses are retried by the callers)
+
+# Balance graph: histories longer than PLOT_MAX_POINTS are downsampled before drawing,
+# with LTTB up to LTTB_MAX_INPUT points and min/max/last time buckets above that
+PLOT_MAX_POINTS = 2000
+LTTB_MAX_INPUT = 200_000
+
+# Columnar export (Parquet/Feather, needs pyarrow)
+EXPORT_ROW_GROUP_SIZE = 10_000  # Transactions per Parquet row group / Feather record batch
+
+# NDJSON transaction log, written record by record while fetching
+NDJSON_FSYNC_RECORDS = 100  # Records written between fsyncs
+NDJSON_FSYNC_INTERVAL = 1.0  # Maximum seconds between fsyncs
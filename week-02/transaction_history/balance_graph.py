@@ -1,55 +1,72 @@
-import pandas as pd
-import seaborn as sns
+import os
+import matplotlib
+
+# The graph is only ever saved to a file, so skip loading a GUI backend (MPLBACKEND still wins)
+if "MPLBACKEND" not in os.environ:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-from datetime import datetime
+import seaborn as sns
+from balance_series import build_balance_series, build_balance_series_from_table
+from downsample import downsample_balance_series
+from CONSTANTS import PLOT_MAX_POINTS, LTTB_MAX_INPUT
 
 class BalanceGraph:
     def __init__(self, wallet_address, transactions_data):
         self.wallet_address = wallet_address
         self.transactions_data = transactions_data
     
-    def __generate_balance_data(self):
-        balance_data = []
-        current_balance = 0.0
+    @classmethod
+    def from_export(cls, wallet_address, path):
+        """
+        Graph a Parquet/Feather export, reading only the columns the balance needs
+        """
+        from transaction_export import load_transactions
+
+        table = load_transactions(path, columns=[
+            "slot", "block_time", "timestamp", "wallet_address", "wallet_balance_before", "wallet_balance_after",
+        ])
+        return cls(wallet_address, table)
 
-        # Sort transactions by timestamp string "YYYY-MM-DD HH:MM:SS"
-        self.transactions_data.sort(key=lambda x: datetime.strptime(x['timestamp'], "%Y-%m-%d %H:%M:%S"))
+    @classmethod
+    def from_ndjson(cls, wallet_address, path):
+        """
+        Graph an NDJSON transaction log, records are streamed from disk instead of loaded up front
+        """
+        from ndjson_sink import iter_ndjson
 
-        for transaction in self.transactions_data:
-            timestamp = transaction['timestamp']
+        return cls(wallet_address, iter_ndjson(path))
 
-            if transaction['from']['address'] == self.wallet_address:
-                # Outgoing transfer
-                current_balance = transaction['from']['balance_after']
-            elif hasattr(transaction, 'to') and transaction['to'][0]['address'] == self.wallet_address:
-                # Incoming transfer
-                current_balance = transaction['to'][0]['balance_after']
-            
-            print(f"Transaction at {timestamp}: Balance updated to {current_balance} SOL")
-            balance_data.append({
-                'timestamp': timestamp,
-                'balance': current_balance
-            })
-        return pd.DataFrame(balance_data)
+    def __generate_balance_data(self):
+        # transactions_data is an exported Arrow table or any iterable of transaction records
+        if hasattr(self.transactions_data, "column_names"):
+            balance_df = build_balance_series_from_table(self.wallet_address, self.transactions_data)
+        else:
+            balance_df = build_balance_series(self.wallet_address, self.transactions_data)
+        print(f"Built balance history from {len(balance_df)} transactions")
+        return balance_df
     
     def plot_balance_graph(self):
         balance_df = self.__generate_balance_data()
-                
-        # Convert timestamp to datetime for better plotting
-        balance_df['timestamp'] = pd.to_datetime(balance_df['timestamp'])
+
+        # Large histories are reduced before drawing, statistics below still use every point
+        plot_df, method = downsample_balance_series(balance_df, PLOT_MAX_POINTS, LTTB_MAX_INPUT)
+        if method:
+            print(f"Plotting {len(plot_df)} of {len(balance_df)} points ({method} downsampling)")
         
         # Create the plot with a modern style
         plt.style.use('seaborn-v0_8-whitegrid')
         fig, ax = plt.subplots(figsize=(14, 7))
         
         # Plot the line with a gradient color based on balance value
-        sns.lineplot(data=balance_df, x='timestamp', y='balance', 
-            linewidth=2.5, color='#3498db', ax=ax)
+        sns.lineplot(data=plot_df, x='timestamp', y='balance', estimator=None, sort=False,
+            linewidth=2.5 if method is None else 1, color='#3498db', ax=ax)
         
-        # Add points for each transaction
-        ax.scatter(balance_df['timestamp'], balance_df['balance'], 
-            color='#e74c3c', s=60, zorder=5, alpha=0.7, 
-            edgecolor='white', linewidth=1.5)
+        # Add points for each transaction (only readable when nothing was downsampled)
+        if method is None:
+            ax.scatter(plot_df['timestamp'], plot_df['balance'], 
+                color='#e74c3c', s=60, zorder=5, alpha=0.7, 
+                edgecolor='white', linewidth=1.5)
         
         # Annotations for extreme points
         max_point = balance_df.loc[balance_df['balance'].idxmax()]
@@ -63,9 +80,9 @@ class BalanceGraph:
               fontsize=9, fontweight='bold')
         
         # Improve formatting
-        ax.set_title(f'Balance History of {len(balance_df)} for {self.wallet_address[:8]}...{self.wallet_address[-4:]}',
+        ax.set_title(f'Balance History of {len(balance_df)} transactions for {self.wallet_address[:8]}...{self.wallet_address[-4:]}',
                fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('Date/Time', fontsize=12, labelpad=10)
+        ax.set_xlabel('Date/Time (UTC)', fontsize=12, labelpad=10)
         ax.set_ylabel('Balance (SOL)', fontsize=12, labelpad=10)
         
         # Add padding to y-axis to better show changes
@@ -77,7 +94,7 @@ class BalanceGraph:
         fig.autofmt_xdate()
         
         # Add shading for trend visibility
-        ax.fill_between(balance_df['timestamp'], 0, balance_df['balance'], 
+        ax.fill_between(plot_df['timestamp'], 0, plot_df['balance'], 
                alpha=0.2, color='#3498db')
         
         # Add a horizontal line for average balance
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def wallet_balance(transaction, wallet_address, key) -> float:
+    """
+    Balance of the wallet before/after the transaction (key), NaN if the record does not carry it
+    """
+    wallet = transaction.get("wallet")
+    if wallet and wallet["address"] == wallet_address:
+        return wallet.get(key, np.nan)
+
+    return np.nan
+
+
+def build_balance_series(wallet_address, transactions) -> pd.DataFrame:
+    """
+    Build the balance history of a wallet as columns, oldest first.
+
+    The records are read in a single pass into NumPy arrays (block time, slot, wallet
+    balance before/after the transaction, from the record's `wallet` entry), so
+    `transactions` can be any iterable, e.g. a lazy NDJSON reader, and no record is
+    kept once read. The arrays are then sorted with one lexsort on the integer block
+    times and forward filled where a record does not carry the wallet's balance.
+
+    Returns a DataFrame with `timestamp`, `block_time`, `slot` and `balance` columns.
+    """
+    slots = []
+    block_times = []
+    balances = []
+    balances_before = []
+    missing_rows = []
+    missing_timestamps = []
+    for transaction in transactions:
+        if transaction is None:
+            continue
+
+        block_time = transaction.get("block_time")
+        if block_time is None:
+            missing_rows.append(len(block_times))
+            missing_timestamps.append(transaction.get("timestamp"))
+            block_time = -1
+
+        slots.append(transaction.get("block") or 0)
+        block_times.append(block_time)
+        balances.append(wallet_balance(transaction, wallet_address, "balance_after"))
+        balances_before.append(wallet_balance(transaction, wallet_address, "balance_before"))
+
+    block_times = np.array(block_times, dtype=np.int64)
+    fill_missing_block_times(block_times, missing_rows, missing_timestamps)
+
+    return balance_series_from_columns(
+        block_times, np.array(slots, dtype=np.int64), np.array(balances, dtype=np.float64),
+        lambda row: balances_before[row],
+    )
+
+
+def build_balance_series_from_table(wallet_address, table) -> pd.DataFrame:
+    """
+    Same as build_balance_series, but straight from the columns of an exported Arrow table
+    """
+    import pyarrow.compute as pc
+
+    is_wallet = pc.fill_null(pc.equal(table["wallet_address"], wallet_address), False).to_numpy(zero_copy_only=False)
+    balances = np.where(is_wallet, pc.fill_null(table["wallet_balance_after"], np.nan).to_numpy(), np.nan)
+    balances_before = np.where(is_wallet, pc.fill_null(table["wallet_balance_before"], np.nan).to_numpy(), np.nan)
+    slots = pc.fill_null(table["slot"], 0).to_numpy().astype(np.int64)
+    block_times = pc.fill_null(table["block_time"], -1).to_numpy().astype(np.int64)
+    missing_rows = np.flatnonzero(block_times < 0)
+    fill_missing_block_times(block_times, missing_rows, table["timestamp"].take(missing_rows).to_pylist())
+
+    return balance_series_from_columns(block_times, slots, balances, lambda row: balances_before[row])
+
+
+def fill_missing_block_times(block_times, rows, timestamps):
+    """
+    Replace the block times at rows in place with the parsed record timestamps
+    """
+    # Records saved before block_time was stored only carry the timestamp, formatted in local time
+    if len(rows):
+        parsed = pd.to_datetime(
+            pd.Series(timestamps), format=TIMESTAMP_FORMAT, errors="coerce",
+        ).dt.tz_localize(datetime.now().astimezone().tzinfo)
+        seconds = (parsed - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+        block_times[rows] = seconds.fillna(0).astype("int64").to_numpy()
+
+
+def balance_series_from_columns(block_times, slots, balances, opening_balance) -> pd.DataFrame:
+    """
+    Order the columns oldest first and forward fill the balances.
+
+    `balances` is NaN where a record does not show the wallet's balance, and
+    `opening_balance(row)` gives the wallet's balance before the record at row.
+    """
+    count = len(block_times)
+
+    # Oldest first, transactions of the same second ordered by slot
+    order = np.lexsort((slots, block_times))
+    block_times = block_times[order]
+    slots = slots[order]
+    balances = balances[order]
+
+    # Forward fill: each NaN takes the last known balance before it
+    known = ~np.isnan(balances)
+    if known.any():
+        last_known = np.maximum.accumulate(np.where(known, np.arange(count), -1))
+        first_known = int(np.argmax(known))
+        balances = np.where(last_known >= 0, balances[np.maximum(last_known, 0)], opening_balance(order[first_known]))
+    else:
+        balances = np.zeros(count)
+
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(block_times, unit="s"),
+        "block_time": block_times,
+        "slot": slots,
+        "balance": balances,
+    })
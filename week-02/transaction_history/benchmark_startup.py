@@ -0,0 +1,46 @@
+"""
+Startup time benchmark: how long importing each entry point takes in a fresh interpreter.
+
+Run from this directory:  python benchmark_startup.py [--runs N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# What each kind of run has to import before doing any work
+SCENARIOS = {
+    "python (baseline)": "pass",
+    "main (no graph)": "import main",
+    "main + balance_graph": "import main, balance_graph",
+}
+
+
+def measure(statement, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters started per scenario (default 10)")
+    args = parser.parse_args()
+
+    # Warm the OS file cache and bytecode caches so the first scenario is not penalised
+    measure("import main, balance_graph", 1)
+
+    print(f"{'Scenario':<24} {'median':>10} {'min':>10} {'max':>10}")
+    print("-" * 57)
+    for name, statement in SCENARIOS.items():
+        timings = measure(statement, args.runs)
+        print(f"{name:<24} {statistics.median(timings) * 1000:>8.0f}ms {min(timings) * 1000:>8.0f}ms "
+              f"{max(timings) * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x, y, threshold) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pick `threshold` points that keep the visual shape.
+
+    The first and last points are always kept. Every bucket in between keeps the point
+    forming the largest triangle with the previously kept point and the average of the
+    next bucket, which favours peaks and troughs.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def min_max_last_indices(times, values, buckets) -> np.ndarray:
+    """
+    OHLC-style reduction: keep the first, lowest, highest and last point of each time window.
+
+    Every extreme of the series survives, so no peak is lost however many points go in.
+    `times` must be sorted.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    span = int(times[-1] - times[0]) + 1
+    bucket_ids = (times - times[0]) * buckets // span
+
+    grouped = pd.Series(np.asarray(values)).groupby(bucket_ids, sort=False)
+    boundaries = np.flatnonzero(np.diff(bucket_ids)) + 1
+    firsts = np.r_[0, boundaries]
+    lasts = np.r_[boundaries - 1, len(times) - 1]
+
+    return np.unique(np.concatenate([firsts, grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy(), lasts]))
+
+
+def downsample_balance_series(balance_df, max_points, lttb_max_input):
+    """
+    Reduce a balance series for plotting, choosing the method from the number of points.
+
+    Up to `max_points` the series is returned as is, up to `lttb_max_input` it goes
+    through LTTB, above that through min/max/last buckets (linear time, bounded
+    output of at most `max_points` points).
+    """
+    count = len(balance_df)
+    if count <= max_points:
+        return balance_df, None
+
+    if count <= lttb_max_input:
+        indices = lttb_indices(balance_df["block_time"].to_numpy(), balance_df["balance"].to_numpy(), max_points)
+        method = "LTTB"
+    else:
+        indices = min_max_last_indices(balance_df["block_time"].to_numpy(), balance_df["balance"].to_numpy(),
+                                       max_points // 4)
+        method = "min/max/last"
+
+    return balance_df.iloc[indices], method
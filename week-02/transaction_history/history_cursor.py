@@ -0,0 +1,59 @@
+import json
+import os
+
+
+class HistoryCursor:
+    """
+    On-disk `before` cursor for walking a wallet's signature history page by page.
+
+    The cursor is written atomically after each page has been handled, so a crash or
+    Ctrl+C resumes from the last finished page instead of the newest signature. When
+    the walk is appended to an output file, its path and size at that point are saved
+    too, so the resumed walk can continue the same file.
+    """
+
+    def __init__(self, path, wallet_address, output=None):
+        self.path = path
+        self.wallet_address = str(wallet_address)
+        self.output = output
+
+    def load(self):
+        """
+        Return the saved state ({"before", "fetched", "output", "output_size"}) or None
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cursor file {self.path}: {e}")
+            return None
+
+        # A cursor left by another wallet is not ours to resume
+        if state.get("wallet") != self.wallet_address or not state.get("before"):
+            return None
+
+        return state
+
+    def save(self, before, fetched):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        state = {"wallet": self.wallet_address, "before": before, "fetched": fetched}
+        if self.output:
+            state["output"] = self.output
+            state["output_size"] = os.path.getsize(self.output)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,69 @@
+import atexit
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+from solana.rpc.api import Client
+
+from CONSTANTS import *
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+clients = {}  # origin -> httpx.Client
+clients_lock = threading.Lock()
+
+
+def get_http_client(url) -> httpx.Client:
+    """
+    Shared keep-alive client for the host of url.
+
+    Each host gets its own connection pool, so HTTP_MAX_CONNECTIONS_PER_HOST caps
+    the concurrency per host. Connections are reused across calls and threads, so
+    TCP/TLS handshakes are paid once per connection instead of once per request.
+    """
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+
+    with clients_lock:
+        client = clients.get(origin)
+        if client is None:
+            client = clients[origin] = httpx.Client(
+                timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(
+                    http2=HTTP2_AVAILABLE,
+                    retries=HTTP_CONNECT_RETRIES,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                        max_keepalive_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                ),
+            )
+
+    return client
+
+
+def rpc_client(endpoint) -> Client:
+    """
+    Solana RPC client that sends its requests through the shared client of the endpoint host
+    """
+    client = Client(endpoint)
+    client._provider.session.close()
+    client._provider.session = get_http_client(endpoint)
+    return client
+
+
+def close_http_clients():
+    with clients_lock:
+        for client in clients.values():
+            client.close()
+        clients.clear()
+
+
+atexit.register(close_http_clients)
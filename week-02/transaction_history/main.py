@@ -1,11 +1,53 @@
 from CONSTANTS import *
+import argparse
 import json
 from solana_wallet import SolanaWallet
-from balance_graph import BalanceGraph
+from transaction_cache import TransactionCache
+from history_cursor import HistoryCursor
+from transaction_dataset import TransactionDataset
+from token_resolver import TokenNameResolver
 from datetime import datetime
 import os
 
-def main():
+ENDPOINTS = {
+    "mainnet": MAINNET_ENDPOINT,
+    "devnet": DEVNET_ENDPOINT,
+    "testnet": TESTNET_ENDPOINT,
+}
+DEFAULT_LIMIT = 50
+
+def prompt_endpoint():
+    endpoint_input = input("Enter the endpoint (mainnet, devnet, testnet): ").strip().lower()
+    if endpoint_input in ENDPOINTS:
+        return ENDPOINTS[endpoint_input]
+
+    print("Invalid endpoint. Defaulting to mainnet.")
+    return MAINNET_ENDPOINT
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Fetch the transaction history of a Solana wallet. "
+                    "Options that are not given are asked for interactively, unless --wallet is given.")
+    parser.add_argument("command", nargs="?", choices=["fetch", "sync"], default="fetch",
+                        help="fetch: save a snapshot of recent transactions (default), "
+                             "sync: add new transactions to json/transactions_<wallet>.ndjson")
+    parser.add_argument("--wallet", help="Solana wallet address")
+    parser.add_argument("--network", choices=list(ENDPOINTS), help="Solana network (default mainnet)")
+    parser.add_argument("--limit", type=int, help=f"Number of transactions to retrieve (default {DEFAULT_LIMIT})")
+    parser.add_argument("--output", help="Directory for the transaction files and the graph (default json/ and img/)")
+    parser.add_argument("--format", choices=["ndjson", "json", "parquet", "feather"], default="ndjson",
+                        help="Format of the transactions file, ndjson/parquet/feather are written while fetching, "
+                             "parquet/feather need pyarrow (default ndjson)")
+    parser.add_argument("--graph", action=argparse.BooleanOptionalAction, default=None,
+                        help="Save the balance graph (default no)")
+    parser.add_argument("--token-names", action=argparse.BooleanOptionalAction, default=False,
+                        help="Resolve the names of the wallet's tokens in the account info (default no)")
+    parser.add_argument("--token-list", action="store_true",
+                        help="Resolve token names from the token list, downloaded once, before the explorer "
+                             "(implies --token-names)")
+    return parser.parse_args()
+
+def main(args):
     # Devnet example
     # wallet_address = "4PkiqJkUvxr9P8C1UsMqGN8NJsUcep9GahDRLfmeu8UK"
     # spaKHLLWQEPtVFjoNeLjjyRWZ8sVu9DRiDAMUwb5CdW
@@ -16,68 +58,147 @@ def main():
     # endpoint = MAINNET_ENDPOINT
     # limit = 50
 
-    wallet_address = input("Enter the Solana wallet address: ")
-    endpoint_input = input("Enter the endpoint (mainnet, devnet, testnet): ").strip().lower()
-    endpoint = None
-    if endpoint_input == "mainnet":
-        endpoint = MAINNET_ENDPOINT
-    elif endpoint_input == "devnet":
-        endpoint = DEVNET_ENDPOINT
-    elif endpoint_input == "testnet":
-        endpoint = TESTNET_ENDPOINT
-    else:
-        print("Invalid endpoint. Defaulting to mainnet.")
-        endpoint = MAINNET_ENDPOINT
-    
-    limit = input("Enter the number of transactions to retrieve (default is 50): ")
-    if not limit.isdigit():
-        print("Invalid input for limit. Defaulting to 50.")
-        limit = 50
+    # With --wallet nothing is prompted, so the script can run from cron
+    interactive = args.wallet is None
+
+    wallet_address = args.wallet or input("Enter the Solana wallet address: ")
+    if args.network:
+        endpoint = ENDPOINTS[args.network]
     else:
-        limit = int(limit)
-    
-    save_graph = input("Do you want to save the balance graph? (yes/no): ").strip().lower()
-    if save_graph not in ["yes", "no"]:
-        print("Invalid input. Defaulting to 'no'.")
-        save_graph = "no"
-    elif save_graph == "yes":
-        save_graph = True
+        endpoint = prompt_endpoint() if interactive else MAINNET_ENDPOINT
+
+    if args.limit is not None:
+        limit = args.limit
+    elif not interactive:
+        limit = DEFAULT_LIMIT
     else:
+        limit = input(f"Enter the number of transactions to retrieve (default is {DEFAULT_LIMIT}): ")
+        if not limit.isdigit():
+            print(f"Invalid input for limit. Defaulting to {DEFAULT_LIMIT}.")
+            limit = DEFAULT_LIMIT
+        else:
+            limit = int(limit)
+
+    if args.graph is not None:
+        save_graph = args.graph
+    elif not interactive:
         save_graph = False
+    else:
+        save_graph = input("Do you want to save the balance graph? (yes/no): ").strip().lower()
+        if save_graph not in ["yes", "no"]:
+            print("Invalid input. Defaulting to 'no'.")
+            save_graph = "no"
+        elif save_graph == "yes":
+            save_graph = True
+        else:
+            save_graph = False
 
-    # Create SolanaWallet instance and fetch transactions
-    wallet = SolanaWallet(wallet_address, endpoint)
-    transactions = wallet.get_recent_transactions(limit=limit)
-    other_info = wallet.get_account_other_info(show_zero_balance_accounts=True) # Slower if we get token names
+    json_dir = args.output or "json"
+    img_dir = args.output or "img"
 
     # Get the current date and time for the filename
     current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Create json directory if it doesn't exist
-    if not os.path.exists("json"):
-        os.makedirs("json")
-
-    # Save transactions and other info to JSON files
-    with open(f"json/transactions_{wallet_address}_{current_time}.json", "w") as f:
-        json.dump(transactions, f, indent=4)
-        print(f"Saved {len(transactions)} transactions to transactions.json")
-    
-    with open(f"json/other_info_{wallet_address}_{current_time}.json", "w") as f:
+    if not os.path.exists(json_dir):
+        os.makedirs(json_dir)
+
+    # Create SolanaWallet instance and fetch transactions
+    cache = TransactionCache(CACHE_DB_PATH)
+    token_resolver = TokenNameResolver(token_list_url=TOKEN_LIST_JSON_URL if args.token_list else None)
+    wallet = SolanaWallet(wallet_address, endpoint, batch_size=BATCH_SIZE, cache=cache, token_resolver=token_resolver)
+    transactions_path = os.path.join(json_dir, f"transactions_{wallet_address}_{current_time}.{args.format}")
+    if args.format == "ndjson":
+        from ndjson_sink import NdjsonSink, truncate_ndjson
+
+        # An interrupted fetch of this wallet is resumed into the same file from its last finished page
+        cursor = HistoryCursor(os.path.join(HISTORY_CURSOR_DIR, f"cursor_{wallet_address}.json"), wallet_address)
+        state = cursor.load()
+        if state and os.path.exists(state.get("output") or ""):
+            transactions_path = state["output"]
+            truncate_ndjson(transactions_path, state["output_size"])
+            print(f"Resuming interrupted fetch into {transactions_path} ({state['fetched']} transactions already saved)")
+        else:
+            cursor.clear()
+        cursor.output = transactions_path
+
+        # One line per record as soon as it is fetched, each page is fsynced before the cursor moves past it
+        with NdjsonSink(transactions_path) as sink:
+            for transaction in wallet.iter_transactions(limit=limit, cursor=cursor, checkpoint=sink.sync):
+                sink.write(transaction)
+        print(f"Saved {sink.records_written} transactions to {transactions_path}")
+    elif args.format == "json":
+        transactions = wallet.get_recent_transactions(limit=limit)
+        with open(transactions_path, "w") as f:
+            json.dump(transactions, f, indent=4)
+        print(f"Saved {len(transactions)} transactions to {transactions_path}")
+    else:
+        from transaction_export import TransactionExportWriter
+
+        # Each page is written as soon as it is fetched, only one row group is held in memory
+        with TransactionExportWriter(transactions_path) as writer:
+            for page in wallet.iter_transaction_pages(page_size=min(limit, SIGNATURES_PAGE_LIMIT), max_transactions=limit):
+                writer.write(page)
+        print(f"Saved {writer.rows_written} transactions to {transactions_path}")
+
+    other_info = wallet.get_account_other_info(show_zero_balance_accounts=True, show_token_names=args.token_names or args.token_list) # Slower with token names
+    cache.close()
+
+    # Save other info to a JSON file
+    other_info_path = os.path.join(json_dir, f"other_info_{wallet_address}_{current_time}.json")
+    with open(other_info_path, "w") as f:
         json.dump(other_info, f, indent=4)
-        print(f"Saved other account info to other_info.json")
-    
+        print(f"Saved other account info to {other_info_path}")
+
     # Create BalanceGraph instance and plot the balance graph
     if save_graph:
-        balance_graph = BalanceGraph(wallet_address, transactions)
+        # Imported here so runs without a graph never load pandas/seaborn/matplotlib
+        from balance_graph import BalanceGraph
+
+        if args.format == "ndjson":
+            balance_graph = BalanceGraph.from_ndjson(wallet_address, transactions_path)
+        elif args.format == "json":
+            balance_graph = BalanceGraph(wallet_address, transactions)
+        else:
+            balance_graph = BalanceGraph.from_export(wallet_address, transactions_path)
         plt = balance_graph.plot_balance_graph()
 
         # Create img directory if it doesn't exist
-        if not os.path.exists("img"):
-            os.makedirs("img")
-            
+        if not os.path.exists(img_dir):
+            os.makedirs(img_dir)
+
         # Save the plot to a file
-        plt.savefig(f"img/balance_graph_{wallet_address}_{current_time}.png")
-        print(f"Balance graph saved as balance_graph_{wallet_address}.png")
+        graph_path = os.path.join(img_dir, f"balance_graph_{wallet_address}_{current_time}.png")
+        plt.savefig(graph_path)
+        print(f"Balance graph saved as {graph_path}")
+
+def sync(args):
+    """
+    Fetch only the transactions newer than the ones already stored for the wallet
+    and append them to json/transactions_<wallet>.ndjson instead of writing a new snapshot
+    """
+    wallet_address = args.wallet or input("Enter the Solana wallet address: ")
+    if args.network:
+        endpoint = ENDPOINTS[args.network]
+    else:
+        endpoint = prompt_endpoint() if args.wallet is None else MAINNET_ENDPOINT
+
+    json_dir = args.output or "json"
+    if not os.path.exists(json_dir):
+        os.makedirs(json_dir)
+
+    # The dataset keeps its own high-water mark, the cache only saves refetching what it already holds
+    dataset = TransactionDataset(os.path.join(json_dir, f"transactions_{wallet_address}.ndjson"))
+    cache = TransactionCache(CACHE_DB_PATH)
+    wallet = SolanaWallet(wallet_address, endpoint, batch_size=BATCH_SIZE, cache=cache)
+    added = dataset.append(wallet.sync_transactions(until=dataset.until))
+    cache.close()
+
+    print(f"Added {added} transactions to {dataset.path} ({dataset.count} total)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.command == "sync":
+        sync(args)
+    else:
+        main(args)
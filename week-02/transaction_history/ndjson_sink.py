@@ -0,0 +1,96 @@
+import json
+import os
+import time
+
+from CONSTANTS import NDJSON_FSYNC_RECORDS, NDJSON_FSYNC_INTERVAL
+
+# orjson is optional and several times faster than the standard library encoder
+try:
+    import orjson
+
+    def encode_line(record) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+    decode_line = orjson.loads
+except ImportError:
+    def encode_line(record) -> bytes:
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+    decode_line = json.loads
+
+
+class NdjsonSink:
+    """
+    Append-only newline-delimited JSON file, one transaction record per line.
+
+    Every record is written as soon as it is handed over. The file is fsynced after
+    NDJSON_FSYNC_RECORDS records or NDJSON_FSYNC_INTERVAL seconds, whichever comes first,
+    so a crash loses at most that batch instead of the whole run.
+    """
+
+    def __init__(self, path, fsync_records=NDJSON_FSYNC_RECORDS, fsync_interval=NDJSON_FSYNC_INTERVAL):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.fsync_records = fsync_records
+        self.fsync_interval = fsync_interval
+        self.file = open(path, "ab")
+        self.records_written = 0
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def write(self, record):
+        if record is None:
+            return
+
+        self.file.write(encode_line(record))
+        self.records_written += 1
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_records or time.monotonic() - self.synced_at >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def truncate_ndjson(path, size):
+    """
+    Drop everything appended to an NDJSON file after its first `size` bytes
+    """
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+
+def iter_ndjson(path):
+    """
+    Yield the records of an NDJSON file one at a time.
+
+    A truncated last line, left by a crash in the middle of a write, is skipped.
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield decode_line(line)
+            except ValueError:
+                if line.endswith(b"\n"):
+                    raise
+                print(f"Skipping truncated last record of {path}")
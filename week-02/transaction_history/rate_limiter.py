@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to one RPC endpoint.
+
+    Each request takes one token. Tokens refill at `rate` per second up to `capacity`.
+    When the endpoint answers 429, `penalize` pauses the whole bucket and halves the
+    rate, so every worker backs off together instead of hammering the node one by one.
+    Successful requests slowly raise the rate back towards the configured maximum.
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=0.2):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero.")
+
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def __refill(self, now):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """
+        Block until a token is available, then take it
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait_time = self.paused_until - now
+                else:
+                    self.__refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait_time = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_time)
+
+    def penalize(self, wait_time):
+        """
+        Pause every worker for `wait_time` seconds and halve the request rate
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + wait_time)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            self.updated_at = max(now, self.paused_until)
+
+    def reward(self):
+        """
+        Additively raise the request rate after a successful request
+        """
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
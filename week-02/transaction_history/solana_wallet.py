@@ -1,38 +1,53 @@
-import requests
+import json
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor
 from CONSTANTS import *
+from rate_limiter import TokenBucket
+from token_resolver import TokenNameResolver
+from http_client import get_http_client, rpc_client
+from token_account_decoder import TOKEN_ACCOUNT_SIZE, decode_token_accounts, decode_extensions, encode_pubkeys
 
 # Libraries for Solana interaction
-from solana.rpc.api import Client
 from solders.pubkey import Pubkey
 from solders.signature import Signature
+from solders.rpc.responses import GetTransactionResp
 from solana.rpc.types import TokenAccountOpts
 
 # Libraries for HTTP error handling
+import httpx
 from httpx import HTTPStatusError
 from solana.exceptions import SolanaRpcException
 
 # Libraries for binary data handling
-import struct
+import numpy as np
 
 class SolanaWallet:
-    def __init__(self, wallet_address, endpoint=MAINNET_ENDPOINT):
+    def __init__(self, wallet_address, endpoint=MAINNET_ENDPOINT, max_workers=MAX_WORKERS, requests_per_second=None, batch_size=None, cache=None, token_resolver=None):
         if not wallet_address or not endpoint:
             raise ValueError("Wallet address and endpoint must be provided.")
         
-        self.client = Client(endpoint)
+        self.client = rpc_client(endpoint)
+        self.endpoint = endpoint
         self.wallet_address = Pubkey.from_string(wallet_address)
-        self.rest_time = 0
+        self.max_workers = max_workers
 
-        if endpoint == MAINNET_ENDPOINT:
-            self.rest_time = MAINNET_REST_TIME
-        elif endpoint == DEVNET_ENDPOINT:
-            self.rest_time = DEVNET_REST_TIME
+        # Batched mode packs up to batch_size getTransaction calls into one POST (None = one call per signature)
+        self.batch_size = batch_size
+        self.http_client = get_http_client(endpoint) if batch_size else None
+
+        # Optional TransactionCache, transactions found there are never refetched
+        self.cache = cache
+
+        # Created on first use unless one is shared between wallets
+        self.token_resolver = token_resolver
+
+        # One limiter per wallet instance, shared by all fetch workers
+        self.limiter = TokenBucket(requests_per_second or RATE_LIMITS.get(endpoint, DEFAULT_RATE_LIMIT))
 
     def __get_sol_balance(self) -> float:
         lamports = 0
         try:
+            self.limiter.acquire()
             lamports = self.client.get_balance(self.wallet_address).value
         except SolanaRpcException as e:
             if hasattr(e, "__cause__") and isinstance(e.__cause__, HTTPStatusError):
@@ -43,27 +58,13 @@ class SolanaWallet:
         sol_balance = lamports / 1_000_000_000  # Convert lamports to SOL
         return sol_balance
 
-    def __get_token_name(self, mint_address, url=TOKEN_LIST_URL) -> str:
-        headers = {"Content-Type": "application/json"}
-        response = requests.get(url + mint_address)
-        
-        if response.status_code != 200:
-            raise Exception(f"Error fetching token name: {response.status_code}")
-        
-        start = response.text.find("<title>") + len("<title>")
-        end = response.text.find("</title>", start)
-        token_name = response.text[start:end].strip().replace("Transaction History | ", "").replace("Token | ", "")
-        print(f"Token Name: {token_name}")
-        
-        return token_name if token_name else "Unknown Token"
-
-    def __get_token_accounts_info(self, show_zero_balance_accounts, show_token_names) -> list:
-        data = []
+    def __get_program_token_accounts(self, program_id) -> list:
         try:
-            data = self.client.get_token_accounts_by_owner(
+            self.limiter.acquire()
+            return self.client.get_token_accounts_by_owner(
                 self.wallet_address,
                 opts=TokenAccountOpts(
-                    program_id=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),
+                    program_id=Pubkey.from_string(program_id),
                 ),
                 commitment="finalized",
             ).value
@@ -73,25 +74,53 @@ class SolanaWallet:
 
             raise Exception(f"Error fetching token accounts: {str(e)}")
 
+    def __get_token_accounts_info(self, show_zero_balance_accounts, show_token_names) -> list:
+        # Query every token program at the same time instead of one after another
+        with ThreadPoolExecutor(max_workers=len(TOKEN_PROGRAM_IDS)) as executor:
+            responses = list(executor.map(self.__get_program_token_accounts, TOKEN_PROGRAM_IDS.values()))
+
+        data = []
+        programs = []
+        for program, accounts in zip(TOKEN_PROGRAM_IDS, responses):
+            data.extend(accounts)
+            programs.extend([program] * len(accounts))
+
+        # Decode every account in one pass instead of slicing and unpacking each one
+        decoded = decode_token_accounts([account.account.data for account in data])
+
+        # Skip accounts with zero balance if show_zero_balance_accounts is False
+        if show_zero_balance_accounts:
+            indices = np.arange(len(decoded))
+        else:
+            indices = np.flatnonzero(decoded["amount"] > 0)
+
+        mints = encode_pubkeys(decoded["mint"][indices])
+        owners = encode_pubkeys(decoded["owner"][indices])
+        amounts = decoded["amount"][indices].tolist()
+
         token_acounts_info = []
-        for account in data:
-            account_info = {   
-                "pubkey": str(account.pubkey),
-                "mint": str(Pubkey.from_bytes(account.account.data[0:32])), # Extract mint address from the first 32 bytes
-                "owner": str(Pubkey.from_bytes(account.account.data[32:64])), # Extract owner address from the next 32 bytes
-                "token_balance": struct.unpack("<Q", account.account.data[64:72])[0], # Extract token balance from bytes 64 to 72
+        for k, i in enumerate(indices.tolist()):
+            account_info = {
+                "pubkey": str(data[i].pubkey),
+                "program": programs[i],
+                "mint": mints[k],
+                "owner": owners[k],
+                "token_balance": amounts[k],
             }
 
-            # Skip accounts with zero balance if show_zero_balance_accounts is False
-            if not show_zero_balance_accounts and account_info["token_balance"] <= 0:
-                continue
+            # Only Token-2022 accounts carry an extension area after the base layout
+            if len(data[i].account.data) > TOKEN_ACCOUNT_SIZE:
+                account_info["extensions"] = decode_extensions(data[i].account.data)
 
             token_acounts_info.append(account_info)
 
-            if show_token_names:
-                # Fetch token names for each mint address
-                token_name = self.__get_token_name(account_info["mint"])
-                account_info["token_name"] = token_name if token_name else "Unknown Token"
+        if show_token_names:
+            # Resolve all token names at once (cached, misses fetched concurrently)
+            if self.token_resolver is None:
+                self.token_resolver = TokenNameResolver()
+            token_names = self.token_resolver.resolve_many([info["mint"] for info in token_acounts_info])
+            for account_info in token_acounts_info:
+                account_info["token_name"] = token_names.get(account_info["mint"]) or "Unknown Token"
         
         # Sort by token balance in descending order
         token_acounts_info.sort(key=lambda x: x["token_balance"], reverse=True)
@@ -100,13 +129,14 @@ class SolanaWallet:
     def __get_signatures_for_address(self, limit, before, until) -> list:
         params = {
             "limit": limit,
-            "before": before,
-            "until": until,
+            "before": Signature.from_string(before) if isinstance(before, str) else before,
+            "until": Signature.from_string(until) if isinstance(until, str) else until,
             "commitment": "finalized"
         }
 
         response = None
         try:
+            self.limiter.acquire()
             response = self.client.get_signatures_for_address(self.wallet_address, **params)
         except SolanaRpcException as e:
             if hasattr(e, "__cause__") and isinstance(e.__cause__, HTTPStatusError):
@@ -126,7 +156,9 @@ class SolanaWallet:
         
         for attempt in range(max_retries):
             try:
+                self.limiter.acquire()
                 transaction = self.client.get_transaction(sig, encoding="jsonParsed", commitment="finalized", max_supported_transaction_version=0)
+                self.limiter.reward()
                 return transaction.value
             except SolanaRpcException as e:
                 if hasattr(e, "__cause__") and isinstance(e.__cause__, HTTPStatusError):
@@ -135,7 +167,8 @@ class SolanaWallet:
                         if attempt < max_retries - 1:
                             wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
                             print(f"Rate limit exceeded. Retrying in {wait_time} seconds... (Attempt {attempt+1}/{max_retries})")
-                            time.sleep(wait_time)
+                            # Pause the shared limiter so every worker backs off, not only this one
+                            self.limiter.penalize(wait_time)
                             continue
                         else:
                             raise Exception(f"Rate limit exceeded after {max_retries} attempts")
@@ -145,6 +178,68 @@ class SolanaWallet:
         # This should not be reached due to the return or exception in the loop
         raise Exception("Failed to get transaction info after maximum retries")
 
+    def __get_transaction_batch(self, signatures) -> list:
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTransaction",
+                "params": [
+                    signature,
+                    {"encoding": "jsonParsed", "commitment": "finalized", "maxSupportedTransactionVersion": 0},
+                ],
+            }
+            for i, signature in enumerate(signatures)
+        ]
+        max_retries = 5
+        retry_delay = 2  # seconds
+
+        for attempt in range(max_retries):
+            try:
+                self.limiter.acquire()
+                response = self.http_client.post(self.endpoint, json=payload)
+            except httpx.HTTPError as e:
+                raise Exception(f"Error fetching transaction batch: {str(e)}")
+
+            if response.status_code == 429:
+                if attempt < max_retries - 1:
+                    wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
+                    print(f"Rate limit exceeded. Retrying batch in {wait_time} seconds... (Attempt {attempt+1}/{max_retries})")
+                    self.limiter.penalize(wait_time)
+                    continue
+                raise Exception(f"Rate limit exceeded after {max_retries} attempts")
+
+            try:
+                results = response.json() if response.status_code == 200 else None
+            except ValueError:
+                results = None
+
+            # The node rejected the batch as a whole (too large or batching disabled): split it in half
+            if not isinstance(results, list):
+                if len(signatures) == 1:
+                    return [self.__get_transaction_info(signatures[0])]
+
+                print(f"Batch of {len(signatures)} rejected ({response.status_code}). Splitting...")
+                middle = len(signatures) // 2
+                return self.__get_transaction_batch(signatures[:middle]) + self.__get_transaction_batch(signatures[middle:])
+
+            self.limiter.reward()
+            results_by_id = {result.get("id"): result for result in results if isinstance(result, dict)}
+
+            transactions = []
+            for i, signature in enumerate(signatures):
+                result = results_by_id.get(i)
+                if result is None or "error" in result:
+                    # Fall back to a single call for entries the batch could not serve
+                    transactions.append(self.__get_transaction_info(signature))
+                else:
+                    transactions.append(GetTransactionResp.from_json(json.dumps(result)).value)
+
+            return transactions
+
+        # This should not be reached due to the return or exception in the loop
+        raise Exception("Failed to get transaction batch after maximum retries")
+
     def __display_transaction_info(self, tx_obj) -> dict:
         if tx_obj is None or tx_obj.transaction is None:
             print("Transaction not found or invalid signature.")
@@ -168,6 +263,7 @@ class SolanaWallet:
             "signature": str(tx.transaction.signatures[0]) if tx.transaction.signatures else "Unknown",
             "block": tx_obj.slot,
             "timestamp": datetime.fromtimestamp(tx_obj.block_time).strftime('%Y-%m-%d %H:%M:%S') if tx_obj.block_time else "Unknown",
+            "block_time": tx_obj.block_time,
             "version": str(tx.version) if hasattr(tx, 'version') else "legacy",
             "fee_in_sol": (meta.fee / lamports_per_sol) if meta else 0,
             "signers": signers,
@@ -212,6 +308,14 @@ class SolanaWallet:
             if recipients:
                 transaction_info["to"] = recipients
 
+        # Every account's balance in lamports, independent of the wallet the record is fetched for,
+        # replaced by the wallet's own entry in __with_wallet_balance before records are returned
+        transaction_info["account_balances"] = {
+            "account_keys": [str(account_key.pubkey) for account_key in account_keys],
+            "pre_balances": list(pre_balances),
+            "post_balances": list(post_balances),
+        }
+
         # Instructions
         transaction_info["instructions"] = []
         for instr in message.instructions:
@@ -232,25 +336,157 @@ class SolanaWallet:
 
         return transaction_info
 
-    def get_recent_transactions(self, limit=10, before=None, until=None) -> list:
-        signatures = self.__get_signatures_for_address(limit, before, until)
-        print(f"Fetched {len(signatures)} signatures for address {self.wallet_address}")
+    def __fetch_transaction(self, signature) -> dict:
+        tx_info = self.__get_transaction_info(signature)
+        transaction_info = self.__display_transaction_info(tx_info)
+        print(f"Fetched transaction for signature: {signature}")
+        return transaction_info
+
+    def __fetch_batch(self, signatures) -> list:
         transactions = []
-        
-        for sig in signatures:
-            # try:
-            tx_info = self.__get_transaction_info(sig)
-            transaction_info = self.__display_transaction_info(tx_info)
-            transactions.append(transaction_info)
-            print(f"Fetched transaction for signature: {sig}")
-            print(f"Sleeping for {self.rest_time} seconds to respect rate limits...")
-            time.sleep(self.rest_time)  # Respect rate limits
-
-            # except Exception as e:
-            #     print(f"Error processing transaction {sig}: {e}")
-        
+        for tx_info in self.__get_transaction_batch(signatures):
+            transactions.append(self.__display_transaction_info(tx_info))
+        print(f"Fetched batch of {len(signatures)} transactions, last signature: {signatures[-1]}")
         return transactions
-    
+
+    def __iter_from_rpc(self, signatures):
+        # Workers are bounded by max_workers, request rate is bounded by the shared limiter
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if not self.batch_size:
+                # map() yields results in the original signature order, each as soon as it and all before it are done
+                yield from executor.map(self.__fetch_transaction, signatures)
+                return
+
+            batches = [signatures[i:i + self.batch_size] for i in range(0, len(signatures), self.batch_size)]
+            for batch in executor.map(self.__fetch_batch, batches):
+                yield from batch
+
+    def __with_wallet_balance(self, transaction):
+        """
+        Record as returned to callers: the raw account balances replaced by the wallet's own entry,
+        its balance at its account-key index whether it paid, sent or received
+        """
+        if transaction is None:
+            return None
+
+        lamports_per_sol = 1_000_000_000
+        transaction = dict(transaction)
+        accounts = transaction.pop("account_balances", None) or {}
+        wallet_address = str(self.wallet_address)
+        wallet = {"address": wallet_address}
+        account_keys = accounts.get("account_keys", [])
+        pre_balances = accounts.get("pre_balances", [])
+        post_balances = accounts.get("post_balances", [])
+        if wallet_address in account_keys:
+            i = account_keys.index(wallet_address)
+            if i < min(len(pre_balances), len(post_balances)):
+                wallet.update({
+                    "account_index": i,
+                    "balance_before": pre_balances[i] / lamports_per_sol,
+                    "balance_after": post_balances[i] / lamports_per_sol,
+                    "balance_change": (post_balances[i] - pre_balances[i]) / lamports_per_sol,
+                })
+
+        transaction["wallet"] = wallet
+        return transaction
+
+    def __iter_transactions(self, signatures):
+        if not self.cache:
+            for transaction in self.__iter_from_rpc(signatures):
+                yield self.__with_wallet_balance(transaction)
+            return
+
+        # Records stored before account balances were kept are fetched again once
+        cached = {
+            sig: tx for sig, tx in self.cache.get_many(signatures).items()
+            if "account_balances" in tx
+        }
+        missing = [sig for sig in signatures if sig not in cached]
+        print(f"{len(cached)} transactions found in cache, {len(missing)} to fetch")
+
+        # Keep the original signature order, cached transactions are interleaved with fetched ones
+        fetched_transactions = self.__iter_from_rpc(missing)
+        fetched = []
+        try:
+            for sig in signatures:
+                if sig in cached:
+                    yield self.__with_wallet_balance(cached[sig])
+                else:
+                    fetched.append(next(fetched_transactions))
+                    yield self.__with_wallet_balance(fetched[-1])
+        finally:
+            # Also when the caller stops early, what was fetched so far is not fetched again next run
+            self.cache.put_many(self.wallet_address, fetched)
+            self.cache.link_many(self.wallet_address, cached.values())
+
+    def get_recent_transactions(self, limit=10, before=None, until=None) -> list:
+        return list(self.iter_transactions(limit, before, until))
+
+    def iter_transactions(self, limit=None, before=None, until=None, page_size=SIGNATURES_PAGE_LIMIT, cursor=None, checkpoint=None):
+        """
+        Walk the wallet history from newest to oldest and yield each parsed transaction as soon as it
+        and all newer ones are fetched, up to `limit` transactions (the whole history without one).
+
+        Signatures are requested `page_size` at a time. With a HistoryCursor, the position is saved
+        after every page the caller has consumed, calling `checkpoint()` first so the caller can make
+        that page durable, and the walk resumes from the last finished page.
+        """
+        fetched = 0
+        state = cursor.load() if cursor else None
+        if state:
+            print(f"Resuming history walk before signature {state['before']}")
+            before = state["before"]
+            fetched = state.get("fetched", 0)
+
+        while limit is None or fetched < limit:
+            page_limit = page_size if limit is None else min(page_size, limit - fetched)
+            signatures = self.__get_signatures_for_address(page_limit, before, until)
+            print(f"Fetched page of {len(signatures)} signatures for address {self.wallet_address}")
+            if not signatures:
+                break
+
+            yield from self.__iter_transactions(signatures)
+
+            # The caller has handled this page, so it never needs to be fetched again
+            fetched += len(signatures)
+            before = signatures[-1]
+            if len(signatures) < page_limit:
+                break
+
+            if cursor:
+                if checkpoint:
+                    checkpoint()
+                cursor.save(before, fetched)
+
+        # The walk is complete, the next one starts again from the newest signature
+        if cursor:
+            cursor.clear()
+
+    def iter_transaction_pages(self, page_size=SIGNATURES_PAGE_LIMIT, before=None, until=None, max_transactions=None, cursor=None, checkpoint=None):
+        """
+        Same walk as iter_transactions, yielding lists of `page_size` parsed transactions
+        """
+        page = []
+        for transaction in self.iter_transactions(max_transactions, before, until, page_size, cursor, checkpoint):
+            page.append(transaction)
+            if len(page) == page_size:
+                yield page
+                page = []
+
+        if page:
+            yield page
+
+    def sync_transactions(self, until=None):
+        """
+        Yield the transactions newer than the `until` signature, newest first (the full history without one)
+        """
+        if until:
+            print(f"Syncing transactions newer than {until}")
+        else:
+            print("No stored transactions for this wallet yet, fetching the full history...")
+
+        yield from self.iter_transactions(until=until)
+
     def get_account_other_info(self, show_zero_balance_accounts=False, show_token_names=False) -> dict:
         print("Fetching SOL balance and token accounts info...")
 
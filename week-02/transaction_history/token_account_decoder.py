@@ -0,0 +1,122 @@
+import numpy as np
+from solders.pubkey import Pubkey
+
+# SPL Token account layout (165 bytes, little endian, no padding)
+TOKEN_ACCOUNT_SIZE = 165
+TOKEN_ACCOUNT_DTYPE = np.dtype([
+    ("mint", "u1", (32,)),
+    ("owner", "u1", (32,)),
+    ("amount", "<u8"),
+    ("delegate_option", "<u4"),  # COption tag: 1 if delegate is set
+    ("delegate", "u1", (32,)),
+    ("state", "u1"),
+    ("is_native_option", "<u4"),  # COption tag: 1 for wrapped SOL accounts
+    ("is_native", "<u8"),  # Rent-exempt reserve of a wrapped SOL account
+    ("delegated_amount", "<u8"),
+    ("close_authority_option", "<u4"),  # COption tag: 1 if close authority is set
+    ("close_authority", "u1", (32,)),
+])
+assert TOKEN_ACCOUNT_DTYPE.itemsize == TOKEN_ACCOUNT_SIZE
+
+# Token-2022 accounts append an account type byte and a TLV extension area to the base layout
+ACCOUNT_TYPE_ACCOUNT = 2
+EXTENSION_TYPES = {
+    1: "transferFeeConfig",
+    2: "transferFeeAmount",
+    3: "mintCloseAuthority",
+    4: "confidentialTransferMint",
+    5: "confidentialTransferAccount",
+    6: "defaultAccountState",
+    7: "immutableOwner",
+    8: "memoTransfer",
+    9: "nonTransferable",
+    10: "interestBearingConfig",
+    11: "cpiGuard",
+    12: "permanentDelegate",
+    13: "nonTransferableAccount",
+    14: "transferHook",
+    15: "transferHookAccount",
+    16: "confidentialTransferFeeConfig",
+    17: "confidentialTransferFeeAmount",
+    18: "metadataPointer",
+    19: "tokenMetadata",
+    20: "groupPointer",
+    21: "tokenGroup",
+    22: "groupMemberPointer",
+    23: "tokenGroupMember",
+    24: "confidentialMintBurn",
+    25: "scaledUiAmount",
+    26: "pausable",
+    27: "pausableAccount",
+}
+
+
+def decode_token_accounts(buffers) -> np.ndarray:
+    """
+    Decode the base layout of many token account buffers into one structured array.
+
+    Each buffer is sliced through a memoryview, so the Token-2022 extension area is never
+    copied, and the base layouts are copied once into a single contiguous block that numpy
+    views in place. Every field is then available as a column, e.g. `decoded["amount"]`.
+    """
+    views = [memoryview(buffer)[:TOKEN_ACCOUNT_SIZE] for buffer in buffers]
+    for view in views:
+        if len(view) < TOKEN_ACCOUNT_SIZE:
+            raise ValueError(f"Token account data must be at least {TOKEN_ACCOUNT_SIZE} bytes, got {len(view)}.")
+
+    return np.frombuffer(b"".join(views), dtype=TOKEN_ACCOUNT_DTYPE)
+
+
+def encode_pubkeys(column) -> list:
+    """
+    Convert a (N, 32) pubkey column to base58 strings, encoding each distinct key once
+    """
+    raw = column.tobytes()
+    encoded = {}
+    pubkeys = []
+    for i in range(0, len(raw), 32):
+        key = raw[i:i + 32]
+        pubkey = encoded.get(key)
+        if pubkey is None:
+            pubkey = encoded[key] = str(Pubkey.from_bytes(key))
+        pubkeys.append(pubkey)
+
+    return pubkeys
+
+
+def decode_extensions(buffer) -> list:
+    """
+    Walk the Token-2022 TLV extension area that follows the base layout of an account.
+
+    Fixed-size account extensions are decoded, anything else is returned as hex.
+    """
+    view = memoryview(buffer)
+    if len(view) <= TOKEN_ACCOUNT_SIZE or view[TOKEN_ACCOUNT_SIZE] != ACCOUNT_TYPE_ACCOUNT:
+        return []
+
+    extensions = []
+    offset = TOKEN_ACCOUNT_SIZE + 1
+    while offset + 4 <= len(view):
+        extension_type = int.from_bytes(view[offset:offset + 2], "little")
+        length = int.from_bytes(view[offset + 2:offset + 4], "little")
+        value = view[offset + 4:offset + 4 + length]
+        offset += 4 + length
+
+        # Type 0 marks the unused tail of the extension area
+        if extension_type == 0:
+            break
+
+        extension = {"type": EXTENSION_TYPES.get(extension_type, f"unknown({extension_type})")}
+        if extension_type == 2 and length == 8:
+            extension["withheld_amount"] = int.from_bytes(value, "little")
+        elif extension_type in (8, 11) and length == 1:
+            extension["enabled"] = bool(value[0])
+        elif extension_type == 15 and length == 1:
+            extension["transferring"] = bool(value[0])
+        elif length:
+            extension["data"] = value.hex()
+
+        extensions.append(extension)
+
+    return extensions
+
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from CONSTANTS import *
+from http_client import get_http_client
+
+
+class TokenNameResolver:
+    """
+    Mint address -> token name lookup with a persistent TTL + LRU cache.
+
+    Lookups are served, in order, from the bulk token list (downloaded once on first
+    use when `token_list_url` is given, or with `load_token_list`), then from the cache,
+    and only then from the explorer page. Cache misses are resolved concurrently.
+    """
+
+    def __init__(self, cache_path=TOKEN_NAME_CACHE_PATH, ttl=TOKEN_NAME_TTL, max_entries=TOKEN_NAME_CACHE_SIZE,
+                 max_workers=MAX_WORKERS, explorer_url=TOKEN_LIST_URL, token_list_url=None):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self.explorer_url = explorer_url
+        self.token_list_url = token_list_url  # Bulk mode, loaded by the first resolve_many call
+
+        self.entries = OrderedDict()  # mint -> [token_name, fetched_at], least recently used first
+        self.token_list = {}  # mint -> token_name, filled by load_token_list
+        self.lock = threading.Lock()
+
+        self.__load_cache()
+
+    def __load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable token name cache {self.cache_path}: {e}")
+            return
+
+        now = time.time()
+        for mint, (token_name, fetched_at) in entries.items():
+            if now - fetched_at < self.ttl:
+                self.entries[mint] = [token_name, fetched_at]
+
+    def save(self):
+        if not self.cache_path:
+            return
+
+        directory = os.path.dirname(self.cache_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self.lock:
+            entries = dict(self.entries)
+
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def load_token_list(self, url=TOKEN_LIST_JSON_URL):
+        """
+        Bulk mode: download a token-list JSON once and serve lookups from memory
+        """
+        print("Loading token list (one-time operation)...")
+        response = get_http_client(url).get(url)
+        if response.status_code != 200:
+            raise Exception(f"Error fetching token list: {response.status_code}")
+
+        self.token_list = {
+            token["address"]: token.get("name") or token.get("symbol") or "Unknown Token"
+            for token in response.json().get("tokens", [])
+        }
+        print(f"Loaded {len(self.token_list)} tokens")
+
+    def __get_cached(self, mint_address):
+        with self.lock:
+            entry = self.entries.get(mint_address)
+            if entry is None:
+                return None
+
+            if time.time() - entry[1] >= self.ttl:
+                del self.entries[mint_address]
+                return None
+
+            self.entries.move_to_end(mint_address)
+            return entry[0]
+
+    def __put_cached(self, mint_address, token_name):
+        with self.lock:
+            self.entries[mint_address] = [token_name, time.time()]
+            self.entries.move_to_end(mint_address)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)  # Evict the least recently used mint
+
+    def __fetch_token_name(self, mint_address) -> str:
+        response = get_http_client(self.explorer_url).get(self.explorer_url + mint_address)
+
+        if response.status_code != 200:
+            raise Exception(f"Error fetching token name: {response.status_code}")
+
+        start = response.text.find("<title>") + len("<title>")
+        end = response.text.find("</title>", start)
+        token_name = response.text[start:end].strip().replace("Transaction History | ", "").replace("Token | ", "")
+        print(f"Token Name: {token_name}")
+
+        return token_name if token_name else "Unknown Token"
+
+    def __try_fetch_token_name(self, mint_address):
+        # One failing mint must not discard the names already resolved in the batch
+        try:
+            return self.__fetch_token_name(mint_address)
+        except Exception as e:
+            print(f"Error resolving token name for {mint_address}: {e}")
+            return None
+
+    def resolve_many(self, mint_addresses) -> dict:
+        """
+        Return {mint: token_name} for every mint, fetching cache misses concurrently
+        """
+        if self.token_list_url:
+            url, self.token_list_url = self.token_list_url, None
+            try:
+                self.load_token_list(url)
+            except Exception as e:
+                print(f"{e}. Falling back to the explorer.")
+
+        names = {}
+        missing = []
+        for mint_address in dict.fromkeys(mint_addresses):
+            token_name = self.token_list.get(mint_address) or self.__get_cached(mint_address)
+            if token_name:
+                names[mint_address] = token_name
+            else:
+                missing.append(mint_address)
+
+        if missing:
+            print(f"Resolving {len(missing)} token names...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for mint_address, token_name in zip(missing, executor.map(self.__try_fetch_token_name, missing)):
+                    if token_name is None:
+                        # Not cached, so the next run tries again instead of keeping the failure for the TTL
+                        names[mint_address] = "Unknown Token"
+                        continue
+
+                    names[mint_address] = token_name
+                    self.__put_cached(mint_address, token_name)
+            self.save()
+
+        return names
+
+    def resolve(self, mint_address) -> str:
+        return self.resolve_many([mint_address])[mint_address]
@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+class TransactionCache:
+    """
+    On-disk SQLite store of parsed transactions keyed by signature.
+
+    Finalized transactions never change, so anything stored here never has to be
+    fetched from the RPC again. Records are stored independently of any wallet (every
+    account's balances, not one wallet's), so a transaction shared by two wallets is
+    fetched once. A second table links signatures to the wallets they were fetched
+    for, indexed by slot.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    MAX_QUERY_PARAMS = 500
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                signature TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS wallet_transactions (
+                wallet TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                PRIMARY KEY (wallet, signature)
+            );
+            CREATE INDEX IF NOT EXISTS idx_transactions_slot ON transactions (slot);
+            CREATE INDEX IF NOT EXISTS idx_wallet_transactions_slot ON wallet_transactions (wallet, slot);
+        """)
+        self.connection.commit()
+
+    def get_many(self, signatures) -> dict:
+        """
+        Return {signature: transaction_info} for every signature already in the cache
+        """
+        found = {}
+        with self.lock:
+            for i in range(0, len(signatures), self.MAX_QUERY_PARAMS):
+                chunk = signatures[i:i + self.MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT signature, data FROM transactions WHERE signature IN ({placeholders})", chunk
+                )
+                for signature, data in rows:
+                    found[signature] = json.loads(data)
+
+        return found
+
+    def put_many(self, wallet_address, transactions):
+        """
+        Store parsed transactions and link them to the wallet they were fetched for
+        """
+        rows = self.__rows(transactions)
+        with self.lock:
+            # REPLACE upgrades records stored before account balances were kept
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO transactions (signature, slot, data) VALUES (?, ?, ?)",
+                [(signature, slot, json.dumps(tx)) for signature, slot, tx in rows]
+            )
+            self.__link(wallet_address, rows)
+            self.connection.commit()
+
+    def link_many(self, wallet_address, transactions):
+        """
+        Link transactions already stored (e.g. fetched for another wallet) to this wallet too
+        """
+        with self.lock:
+            self.__link(wallet_address, self.__rows(transactions))
+            self.connection.commit()
+
+    def __rows(self, transactions) -> list:
+        return [
+            (tx["signature"], tx["block"], tx)
+            for tx in transactions
+            if tx and tx.get("signature") not in (None, "Unknown")
+        ]
+
+    def __link(self, wallet_address, rows):
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO wallet_transactions (wallet, signature, slot) VALUES (?, ?, ?)",
+            [(str(wallet_address), signature, slot) for signature, slot, _ in rows]
+        )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
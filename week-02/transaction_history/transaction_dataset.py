@@ -0,0 +1,116 @@
+import json
+import os
+
+from ndjson_sink import NdjsonSink, iter_ndjson, truncate_ndjson
+
+
+class TransactionDataset:
+    """
+    Append-only NDJSON history of one wallet, kept up to date by sync.
+
+    A small state file next to the dataset is its high-water mark: the newest signature
+    (the `until` of the next sync), the newest slot with every signature of that slot, the
+    number of records and the committed size of the file. A sync therefore only appends
+    the new transactions, whatever else the transaction cache holds, and never reads or
+    rewrites the records already stored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state_path = f"{path}.state.json"
+        self.state = self.__load_state()
+
+    def __load_state(self) -> dict:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+
+        if os.path.exists(self.path):
+            return self.__rebuild_state()
+
+        return {}
+
+    def __rebuild_state(self) -> dict:
+        # The state file was lost, scan the dataset once. Any signature of the newest slot is a valid
+        # `until`, its same-slot siblings that come back in the delta are skipped as duplicates.
+        print(f"Rebuilding the sync state of {self.path}...")
+        newest_slot = None
+        newest_signatures = set()
+        count = 0
+        for transaction in iter_ndjson(self.path):
+            count += 1
+            if newest_slot is None or transaction["block"] > newest_slot:
+                newest_slot = transaction["block"]
+                newest_signatures = {transaction["signature"]}
+            elif transaction["block"] == newest_slot:
+                newest_signatures.add(transaction["signature"])
+
+        return {
+            "until": min(newest_signatures) if newest_signatures else None,
+            "newest_slot": newest_slot,
+            "newest_signatures": sorted(newest_signatures),
+            "count": count,
+            "size": os.path.getsize(self.path),
+        }
+
+    def __save_state(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def until(self):
+        """
+        Newest signature of the dataset, None while it is empty
+        """
+        return self.state.get("until")
+
+    @property
+    def count(self) -> int:
+        return self.state.get("count", 0)
+
+    def append(self, transactions) -> int:
+        """
+        Append the transactions (newest first) that the dataset does not hold yet and commit them
+        """
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self.state.get("size", 0):
+            # Drop the records of a sync that crashed before committing, they are fetched again
+            truncate_ndjson(self.path, self.state.get("size", 0))
+
+        # Only signatures of the newest stored slot can come back in the delta: `until` is the newest
+        # signature, so everything before its slot is older, while its same-slot siblings may not be
+        newest_slot = self.state.get("newest_slot")
+        newest_signatures = set(self.state.get("newest_signatures", ()))
+        known_signatures = set(newest_signatures)
+        until = self.until
+        first = True
+
+        with NdjsonSink(self.path) as sink:
+            for transaction in transactions:
+                if transaction is None or transaction["signature"] in known_signatures:
+                    continue
+
+                sink.write(transaction)
+                if first:
+                    until = transaction["signature"]
+                    first = False
+
+                slot = transaction["block"]
+                if newest_slot is None or slot > newest_slot:
+                    newest_slot = slot
+                    newest_signatures = {transaction["signature"]}
+                elif slot == newest_slot:
+                    newest_signatures.add(transaction["signature"])
+
+        self.state = {
+            "until": until,
+            "newest_slot": newest_slot,
+            "newest_signatures": sorted(newest_signatures),
+            "count": self.count + sink.records_written,
+            "size": os.path.getsize(self.path),
+        }
+        self.__save_state()
+        return sink.records_written
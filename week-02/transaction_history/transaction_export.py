@@ -0,0 +1,162 @@
+import os
+
+from CONSTANTS import EXPORT_ROW_GROUP_SIZE
+
+# pyarrow is optional, only the Parquet/Feather export needs it (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_FORMATS = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+
+def transaction_schema():
+    """
+    Arrow schema of one flattened transaction record
+    """
+    return pa.schema([
+        ("signature", pa.string()),
+        ("slot", pa.int64()),
+        ("block_time", pa.int64()),
+        ("timestamp", pa.string()),
+        ("version", pa.string()),
+        ("fee_in_sol", pa.float64()),
+        ("compute_units_consumed", pa.int64()),
+        ("signers", pa.list_(pa.string())),
+        ("from_address", pa.string()),
+        ("from_balance_before", pa.float64()),
+        ("from_balance_after", pa.float64()),
+        ("from_balance_change", pa.float64()),
+        ("to_addresses", pa.list_(pa.string())),
+        ("to_balance_before", pa.list_(pa.float64())),
+        ("to_balance_after", pa.list_(pa.float64())),
+        ("to_balance_change", pa.list_(pa.float64())),
+        ("wallet_address", pa.string()),
+        ("wallet_balance_before", pa.float64()),
+        ("wallet_balance_after", pa.float64()),
+        ("wallet_balance_change", pa.float64()),
+        ("program_ids", pa.list_(pa.string())),
+        ("instruction_types", pa.list_(pa.string())),
+    ])
+
+
+def flatten_transactions(transactions) -> dict:
+    """
+    Turn transaction_info records into one list per column
+    """
+    columns = {name: [] for name in transaction_schema().names}
+    for transaction in transactions:
+        if transaction is None:
+            continue
+
+        sender = transaction.get("from") or {}
+        recipients = transaction.get("to", [])
+        wallet = transaction.get("wallet") or {}
+        instructions = transaction.get("instructions", [])
+
+        columns["signature"].append(transaction["signature"])
+        columns["slot"].append(transaction.get("block"))
+        columns["block_time"].append(transaction.get("block_time"))
+        columns["timestamp"].append(transaction.get("timestamp"))
+        columns["version"].append(transaction.get("version"))
+        columns["fee_in_sol"].append(transaction.get("fee_in_sol"))
+        columns["compute_units_consumed"].append(transaction.get("compute_units_consumed"))
+        columns["signers"].append(transaction.get("signers", []))
+        columns["from_address"].append(sender.get("address"))
+        columns["from_balance_before"].append(sender.get("balance_before"))
+        columns["from_balance_after"].append(sender.get("balance_after"))
+        columns["from_balance_change"].append(sender.get("balance_change"))
+        columns["to_addresses"].append([recipient["address"] for recipient in recipients])
+        columns["to_balance_before"].append([recipient["balance_before"] for recipient in recipients])
+        columns["to_balance_after"].append([recipient["balance_after"] for recipient in recipients])
+        columns["to_balance_change"].append([recipient["balance_change"] for recipient in recipients])
+        columns["wallet_address"].append(wallet.get("address"))
+        columns["wallet_balance_before"].append(wallet.get("balance_before"))
+        columns["wallet_balance_after"].append(wallet.get("balance_after"))
+        columns["wallet_balance_change"].append(wallet.get("balance_change"))
+        columns["program_ids"].append([instruction.get("program_id") for instruction in instructions])
+        columns["instruction_types"].append([instruction.get("type") for instruction in instructions])
+
+    return columns
+
+
+def export_format(path) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export file {path}, use one of {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[extension]
+
+
+class TransactionExportWriter:
+    """
+    Streams transaction records into a Parquet or Feather (Arrow IPC) file.
+
+    Records are buffered until `row_group_size` of them are waiting, then written as
+    one row group / record batch, so memory stays bounded however long the history is.
+    """
+
+    def __init__(self, path, row_group_size=EXPORT_ROW_GROUP_SIZE):
+        if pa is None:
+            raise ImportError("Parquet/Feather export requires pyarrow (pip install pyarrow).")
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.format = export_format(path)
+        self.row_group_size = row_group_size
+        self.schema = transaction_schema()
+        self.pending = []
+        self.rows_written = 0
+
+        if self.format == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.writer = ipc.new_file(path, self.schema, options=ipc.IpcWriteOptions(compression="zstd"))
+
+    def write(self, transactions):
+        """
+        Add records, writing every full row group
+        """
+        self.pending.extend(transaction for transaction in transactions if transaction is not None)
+        while len(self.pending) >= self.row_group_size:
+            self.__write_batch(self.pending[:self.row_group_size])
+            self.pending = self.pending[self.row_group_size:]
+
+    def __write_batch(self, transactions):
+        batch = pa.RecordBatch.from_pydict(flatten_transactions(transactions), schema=self.schema)
+        if self.format == "parquet":
+            self.writer.write_batch(batch, row_group_size=len(transactions))
+        else:
+            self.writer.write_batch(batch)
+        self.rows_written += len(transactions)
+
+    def close(self):
+        if self.pending:
+            self.__write_batch(self.pending)
+            self.pending = []
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_transactions(path, columns=None):
+    """
+    Read an exported file back as an Arrow table, optionally only some columns
+    """
+    if pa is None:
+        raise ImportError("Reading Parquet/Feather exports requires pyarrow (pip install pyarrow).")
+
+    if export_format(path) == "parquet":
+        return pq.read_table(path, columns=columns)
+
+    table = ipc.open_file(path).read_all()
+    return table.select(columns) if columns else table